@@ -1,22 +1,26 @@
 import os
+import argparse
 from dotenv import load_dotenv
 from src.quiz.generator import QuizGenerator
+from src.quiz.inventory import QuizInventory
 from src.video.generator import QuizVideoGenerator
+from src.video.render_profiles import RENDER_PROFILES
 from src.utils.youtube_uploader import YouTubeUploader
-from src.quiz_topics import get_random_topic
-from datetime import datetime
+from src.utils.quota_ledger import QuotaLedger
+from src.batch import BatchPublisher
+from src.quiz_topics import QUIZ_TOPICS, get_random_topic, get_topic
 
 def generate_video_metadata(quiz_data_list, topic_info):
     """동영상 메타데이터 생성"""
     title = f"Fun {topic_info['name']} Quiz! | Test Your Knowledge 🎯"
     
-    description_topics = [quiz["question"].replace("?", "").lower() for quiz in quiz_data_list]
+    description_topics = "".join(
+        f"✨ {quiz['question'].replace('?', '').lower()}\n" for quiz in quiz_data_list
+    )
     description = (
         f"Test your knowledge about {topic_info['name'].lower()} with this fun quiz!\n\n"
         f"In this quiz, you'll learn about:\n"
-        f"✨ {description_topics[0]}\n"
-        f"✨ {description_topics[1]}\n"
-        f"✨ {description_topics[2]}\n\n"
+        f"{description_topics}\n"
         f"#quiz #learning #{topic_info['id']} #{topic_info['name'].lower().replace(' ', '')} #educational #shorts"
     )
     
@@ -34,6 +38,10 @@ def setup_directories():
         os.makedirs(directory, exist_ok=True)
 
 def main():
+    inventory = None
+    video_gen = None
+    quiz_data_list = []
+    published = False
     try:
         # 환경 변수 로드
         load_dotenv()
@@ -42,44 +50,37 @@ def main():
         setup_directories()
 
         # 인스턴스 생성
-        quiz_gen = QuizGenerator(os.getenv("CLAUDE_API_KEY"))
-        video_gen = QuizVideoGenerator()
+        inventory = QuizInventory()
+        quiz_gen = QuizGenerator(os.getenv("CLAUDE_API_KEY"), inventory=inventory)
+        # 업로드하는 경로는 환경 변수와 무관하게 publish 프로필로 고정
+        video_gen = QuizVideoGenerator(render_profile="publish")
         youtube_uploader = YouTubeUploader()
         
         # 랜덤한 퀴즈 주제 선택
         topic_info = get_random_topic()
         print(f"\nSelected topic: {topic_info['name']} ({topic_info['id']})")
         
-        # 퀴즈 생성
-        quiz_data_list = quiz_gen.generate_quiz(
-            topic_info['id'],
-            count=3,
-            prompt=topic_info['prompt']
-        )
-        
-        if not quiz_data_list:
-            print("Failed to generate quiz data")
-            return
+        # 퀴즈 준비 (인벤토리의 미사용 퀴즈 우선, 부족하면 스트리밍 생성)
+        # (스트림이면 실제 퀴즈는 비디오를 구성하면서 도착함)
+        quiz_data_list = quiz_gen.get_quizzes(topic_info, count=3, stream=True)
             
-        # 비디오 생성
-        print("Creating video...")
-        video_file = video_gen.create_video(
+        # 비디오 생성 (배경음악과 TTS를 포함해서 한 번에 인코딩, 3개 미만이면 인코딩 안 함)
+        print("Creating video with background music and TTS...")
+        final_video = video_gen.create_video(
             quiz_data_list, 
-            category=f"{topic_info['name']} Quiz"
+            category=f"{topic_info['name']} Quiz",
+            with_audio=True,
+            expected_count=3
         )
+        # 스트리밍이면 실제로 받은 퀴즈 목록으로 교체
+        quiz_data_list = video_gen.quiz_data_list
         
-        if not video_file:
-            print("Failed to generate video")
+        if len(quiz_data_list) < 3:
+            print(f"Failed to generate quiz data ({len(quiz_data_list)}/3 quizzes)")
             return
-            
-        print(f"Video created: {video_file}")
-        
-        # 배경음악과 TTS 추가
-        print("\nAdding background music and TTS...")
-        final_video = video_gen.add_background_music(video_file, quiz_data_list)  # quiz_data_list 추가
         
         if not final_video:
-            print("Failed to add audio")
+            print("Failed to generate video")
             return
             
         print(f"Final video with audio created: {final_video}")
@@ -100,6 +101,8 @@ def main():
         
         if video_id:
             print(f"Video uploaded successfully! ID: {video_id}")
+            inventory.mark_published(quiz_data_list, video_id)
+            published = True
         else:
             print("Failed to upload video")
             
@@ -107,6 +110,85 @@ def main():
         print(f"\nError during execution: {str(e)}")
         import traceback
         traceback.print_exc()
+    finally:
+        # 게시하지 못한 퀴즈는 예외로 중단된 경우에도 예약 해제
+        # (스트리밍 중이었으면 실제로 받은 퀴즈 목록은 video_gen에 있음)
+        if inventory is not None and not published:
+            if not isinstance(quiz_data_list, list):
+                quiz_data_list = getattr(video_gen, "quiz_data_list", [])
+            inventory.release(quiz_data_list or [])
+
+def run_batch(args):
+    """배치 모드: 여러 비디오를 한 프로세스에서 생성/업로드"""
+    try:
+        load_dotenv()
+        setup_directories()
+        
+        # 모든 항목에서 재사용할 인스턴스
+        inventory = QuizInventory()
+        quota = QuotaLedger.from_env()
+        quiz_gen = QuizGenerator(os.getenv("CLAUDE_API_KEY"), inventory=inventory)
+        youtube_uploader = YouTubeUploader(quota_ledger=quota)
+        publisher = BatchPublisher(
+            quiz_gen,
+            youtube_uploader,
+            generate_video_metadata,
+            inventory=inventory,
+            quota=quota,
+            render_workers=args.render_workers,
+            upload=not args.no_upload,
+            # 업로드할 때는 publish, 렌더링만 할 때는 RENDER_PROFILE 환경 변수 기본값
+            render_profile=args.profile or (None if args.no_upload else "publish")
+        )
+        
+        if args.topics:
+            topics = [get_topic(topic.strip()) for topic in args.topics.split(",")]
+        else:
+            count = publisher.quota_remaining() if args.fill_quota else args.count
+            if count == 0:
+                print(f"No upload quota left today. Next upload slot: {quota.next_slot():%Y-%m-%d %H:%M}")
+                return
+            topics = publisher.pick_topics(count)
+        
+        remaining = publisher.quota_remaining()
+        if not args.no_upload and len(topics) > remaining:
+            print(f"Only {remaining} uploads left today; the rest will wait for the next upload slot")
+        
+        print(f"Batch topics: {', '.join(topic['id'] for topic in topics)}")
+        publisher.run(topics)
+        
+    except Exception as e:
+        print(f"\nError during batch execution: {str(e)}")
+        import traceback
+        traceback.print_exc()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Quiz video generator")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    batch = subparsers.add_parser("batch", help="여러 비디오를 한 번에 생성/업로드")
+    target = batch.add_mutually_exclusive_group(required=True)
+    target.add_argument("--count", type=int, help="생성할 비디오 수 (랜덤 주제)")
+    target.add_argument("--topics", help=f"쉼표로 구분한 주제 ID ({', '.join(QUIZ_TOPICS)})")
+    target.add_argument("--fill-quota", action="store_true", help="오늘 남은 업로드 수만큼 생성")
+    batch.add_argument("--render-workers", type=int, default=1, help="렌더링 워커 수")
+    batch.add_argument("--no-upload", action="store_true", help="렌더링까지만 실행")
+    batch.add_argument("--profile", choices=list(RENDER_PROFILES),
+                       help="렌더 프로필 (기본: publish, --no-upload이면 RENDER_PROFILE 환경 변수, "
+                            "draft는 --no-upload와 함께만 사용 가능)")
+    
+    args = parser.parse_args()
+    if args.command == "batch" and args.profile == "draft" and not args.no_upload:
+        parser.error("--profile draft is a low-quality preview; use it with --no-upload")
+    if args.command == "batch" and args.topics:
+        unknown = [topic.strip() for topic in args.topics.split(",") if topic.strip() not in QUIZ_TOPICS]
+        if unknown:
+            parser.error(f"unknown topics: {', '.join(unknown)}")
+    return args
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    if args.command == "batch":
+        run_batch(args)
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,156 @@
+# src/audio/asset_cache.py
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from src.video.ffmpeg_tools import decode_pcm
+
+
+class AudioAssetCache:
+    """디코딩한 오디오(PCM)를 디스크에 저장하는 캐시
+
+    (파일 내용 해시, 샘플레이트, 채널 수)별로 int16 .npy 파일을 한 번만 만들고,
+    이후에는 memory-mapped 배열(샘플 수 x 채널, 읽기 전용)로 바로 읽는다.
+    배경음악과 효과음을 섹션/실행마다 ffmpeg로 다시 디코딩하지 않는다.
+
+    TTS 나레이션처럼 매번 새로 생기는 파일은 persist=False로 읽어서 디스크에
+    남기지 않는다 (메모리 LRU에만 잠깐 보관). 메모리에 보관하는 배열과 해시는
+    최근 max_items개까지만 유지하고, 디스크 캐시는 max_bytes를 넘으면 오래
+    쓰지 않은 파일부터 지운다.
+    """
+
+    def __init__(self, cache_dir=os.path.join("assets", "audio", "pcm_cache"), sample_rate=44100, channels=2,
+                 max_items=64, max_bytes=1 << 30):
+        self.cache_dir = cache_dir
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # (절대 경로, 크기, 수정 시간) -> 내용 해시 (LRU)
+        self._digests = OrderedDict()
+        # 캐시 키 -> memmap 또는 메모리 배열 (LRU)
+        self._arrays = OrderedDict()
+
+    @classmethod
+    def from_env(cls):
+        """환경 변수 설정으로 생성"""
+        return cls(
+            os.getenv('AUDIO_CACHE_DIR', os.path.join("assets", "audio", "pcm_cache")),
+            max_bytes=int(os.getenv('AUDIO_CACHE_MAX_MB', '1024')) * (1 << 20)
+        )
+
+    def _remember(self, cache, key, value):
+        """LRU 딕셔너리에 추가하고 max_items를 넘는 오래된 항목 제거 (_lock 안에서 호출)"""
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.max_items:
+            cache.popitem(last=False)
+
+    def _recall(self, cache, key):
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+    def _digest(self, path):
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        digest = self._recall(self._digests, key)
+        if digest is None:
+            sha1 = hashlib.sha1()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    sha1.update(block)
+            digest = sha1.hexdigest()
+            self._remember(self._digests, key, digest)
+        return digest
+
+    def cache_path(self, path, sample_rate=None, channels=None):
+        sample_rate = sample_rate or self.sample_rate
+        channels = channels or self.channels
+        return os.path.join(self.cache_dir, f"{self._digest(path)}_{sample_rate}_{channels}.npy")
+
+    def load(self, path, sample_rate=None, channels=None, persist=True):
+        """int16 샘플 배열 반환
+
+        persist=True(배경음악, 효과음)면 캐시에 없을 때 ffmpeg로 한 번 디코딩해서
+        .npy로 저장하고 memmap을 반환한다. persist=False(TTS 나레이션)면
+        디스크에 쓰지 않고 메모리에서만 디코딩한다.
+        """
+        sample_rate = sample_rate or self.sample_rate
+        channels = channels or self.channels
+        with self._lock:
+            npy_path = self.cache_path(path, sample_rate, channels)
+            samples = self._recall(self._arrays, npy_path)
+        if samples is not None:
+            return samples
+
+        if not persist:
+            pcm = np.frombuffer(decode_pcm(path, sample_rate, channels), dtype=np.int16)
+            samples = pcm.reshape(-1, channels)
+        else:
+            if os.path.exists(npy_path):
+                # 최근에 쓴 파일이 정리 대상에서 늦게 빠지도록 접근 시각 갱신
+                os.utime(npy_path)
+            else:
+                print(f"Decoding audio asset: {path}")
+                pcm = np.frombuffer(decode_pcm(path, sample_rate, channels), dtype=np.int16)
+                tmp_path = f"{npy_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    np.save(f, pcm.reshape(-1, channels))
+                os.replace(tmp_path, npy_path)
+                self._evict_files(keep=npy_path)
+            samples = np.load(npy_path, mmap_mode="r")
+
+        with self._lock:
+            self._remember(self._arrays, npy_path, samples)
+        return samples
+
+    def _evict_files(self, keep=None):
+        """디스크 캐시가 max_bytes를 넘으면 오래 쓰지 않은 .npy부터 삭제"""
+        try:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith(".npy"):
+                    continue
+                file_path = os.path.join(self.cache_dir, name)
+                stat = os.stat(file_path)
+                entries.append((stat.st_mtime, stat.st_size, file_path))
+        except OSError as e:
+            print(f"Error scanning audio cache: {e}")
+            return
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, file_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if file_path == keep:
+                continue
+            try:
+                # 이미 열린 memmap은 삭제 후에도 계속 읽을 수 있음
+                os.remove(file_path)
+                total -= size
+            except OSError:
+                pass
+
+    def duration(self, path, sample_rate=None, persist=True):
+        """오디오 길이 (초)"""
+        sample_rate = sample_rate or self.sample_rate
+        return len(self.load(path, sample_rate, persist=persist)) / sample_rate
+
+
+# 같은 프로세스의 믹서와 비디오 생성기가 공유하는 기본 캐시
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def default_audio_cache():
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = AudioAssetCache.from_env()
+        return _default_cache
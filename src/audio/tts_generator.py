@@ -1,120 +1,191 @@
 # src/audio/tts_generator.py
-from google.cloud import texttospeech
 from pydub import AudioSegment
 import os
+import numpy as np
+import shutil
+from src.audio.tts_service import TTSService, GoogleCloudTTSBackend, quiz_narration_texts
+from src.audio.asset_cache import default_audio_cache
 
 class AudioGenerator:
-    def __init__(self, language_code="en-US"):
-        self.client = texttospeech.TextToSpeechClient()
+    def __init__(self, language_code="en-US", tts_service=None):
         self.language_code = language_code
-        self.voice = texttospeech.VoiceSelectionParams(
-            language_code=language_code,
-            name="en-US-Neural2-D",
-            ssml_gender=texttospeech.SsmlVoiceGender.FEMALE
-        )
-        self.audio_config = texttospeech.AudioConfig(
-            audio_encoding=texttospeech.AudioEncoding.MP3
+        self.tts = tts_service or TTSService(
+            GoogleCloudTTSBackend(language_code=language_code, voice_name="en-US-Neural2-D")
         )
 
     def generate_tts(self, text, output_path):
-        """TTS 생성"""
-        synthesis_input = texttospeech.SynthesisInput(text=text)
-        response = self.client.synthesize_speech(
-            input=synthesis_input,
-            voice=self.voice,
-            audio_config=self.audio_config
-        )
-
-        with open(output_path, "wb") as out:
-            out.write(response.audio_content)
+        """TTS 생성 (캐시된 음성을 output_path로 복사)"""
+        shutil.copyfile(self.tts.synthesize(text), output_path)
         return output_path
 
     def create_quiz_audio(self, quiz_data, base_path):
-        """퀴즈 오디오 생성"""
-        audio_paths = {
-            'question': self.generate_tts(
-                quiz_data['question'],
-                os.path.join(base_path, f"question_{quiz_data['id']}.mp3")
-            ),
-            'answer': self.generate_tts(
-                f"The answer is {quiz_data['answer']}",
-                os.path.join(base_path, f"answer_{quiz_data['id']}.mp3")
-            ),
-            'fact': self.generate_tts(
-                quiz_data['fun_fact'],
-                os.path.join(base_path, f"fact_{quiz_data['id']}.mp3")
+        """퀴즈 오디오 생성 (세 문장을 동시에 합성)"""
+        texts = quiz_narration_texts(quiz_data)
+        cached_paths = self.tts.synthesize_many(list(texts.values()))
+        
+        audio_paths = {}
+        for name, text in texts.items():
+            if cached_paths.get(text) is None:
+                raise RuntimeError(f"TTS synthesis failed for {name}")
+            output_path = os.path.join(
+                base_path, f"{name}_{quiz_data['id']}{self.tts.backend.extension}"
             )
-        }
+            shutil.copyfile(cached_paths[text], output_path)
+            audio_paths[name] = output_path
         return audio_paths
 
 # src/audio/audio_mixer.py
 class AudioMixer:
-    def __init__(self, base_path="assets/audio"):
+    """numpy 샘플 버퍼 기반 오디오 믹서
+
+    각 에셋은 AudioAssetCache로 한 번만 디코딩한 int16 memmap을 그대로 읽고,
+    미리 할당한 float32 타임라인 버퍼 하나에 게인을 곱해 더한다.
+    최종 트랙은 마지막에 한 번만 int16으로 변환해서 내보낸다.
+    """
+
+    def __init__(self, base_path="assets/audio", sample_rate=44100, channels=2, asset_cache=None):
         self.base_path = base_path
         self.bgm_path = os.path.join(base_path, "bgm")
         self.effects_path = os.path.join(base_path, "effects")
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.asset_cache = asset_cache or default_audio_cache()
+
+    def load_samples(self, path, persist=True):
+        """오디오 파일의 int16 샘플 배열 (디스크 캐시의 memmap, 읽기 전용)
+
+        TTS 나레이션은 persist=False로 읽어서 디스크 캐시에 남기지 않는다.
+        """
+        return self.asset_cache.load(path, self.sample_rate, self.channels, persist=persist)
 
     def load_bgm(self, filename):
         """배경 음악 로드"""
-        return AudioSegment.from_file(os.path.join(self.bgm_path, filename))
+        return self.load_samples(os.path.join(self.bgm_path, filename))
 
     def load_effect(self, effect_name):
         """효과음 로드"""
-        return AudioSegment.from_file(os.path.join(self.effects_path, effect_name))
+        return self.load_samples(os.path.join(self.effects_path, effect_name))
 
-    def create_quiz_section_audio(self, tts_paths, duration=15000):
-        """퀴즈 섹션 오디오 생성"""
-        # 기본 배경음악
-        bgm = self.load_bgm("quiz_bgm.mp3")
-        bgm = bgm[:duration]
-        bgm = bgm - 20  # 배경음악 볼륨 낮춤
+    def _to_samples(self, ms):
+        return int(ms * self.sample_rate / 1000)
 
-        # TTS 로드
-        question = AudioSegment.from_file(tts_paths['question'])
-        answer = AudioSegment.from_file(tts_paths['answer'])
-        fact = AudioSegment.from_file(tts_paths['fact'])
+    def _timeline(self, length):
+        return np.zeros((length, self.channels), dtype=np.float32)
 
-        # 효과음 로드
-        timer_tick = self.load_effect("timer_tick.mp3")
-        correct_sound = self.load_effect("correct.mp3")
+    def _mix(self, timeline, samples, position, end=None, gain_db=0, loop=False):
+        """timeline[position:end]에 samples를 게인을 적용해서 더함
 
-        # 최종 오디오 생성
-        final_audio = bgm
-        
-        # 질문 추가 (0초)
-        final_audio = final_audio.overlay(question, position=0)
-        
-        # 타이머 효과음 추가 (4-8초)
+        범위를 넘는 부분은 자르고, loop=True면 samples가 짧을 때 반복해서 끝까지 채운다.
+        """
+        end = len(timeline) if end is None else min(end, len(timeline))
+        if len(samples) == 0:
+            return
+        # int16 -> float 변환과 게인을 한 번의 곱셈으로 처리
+        scale = np.float32(10 ** (gain_db / 20) / 32768.0)
+        while position < end:
+            count = min(len(samples), end - position)
+            timeline[position:position + count] += samples[:count] * scale
+            position += count
+            if not loop:
+                break
+
+    def section_length(self, duration=15000, timing=None):
+        """섹션 길이 (샘플)
+
+        timing이 있으면 비디오 섹션과 같은 길이, 없으면 기존처럼
+        배경음악이 더 짧을 때 배경음악 길이.
+        """
+        if timing is not None:
+            return self._to_samples(timing.duration * 1000)
+        return min(len(self.load_bgm("quiz_bgm.mp3")), self._to_samples(duration))
+
+    def create_quiz_section_audio(self, tts_paths, duration=15000, timeline=None, offset=0, timing=None):
+        """퀴즈 섹션 오디오 생성
+
+        timeline이 주어지면 offset(샘플) 위치부터 그 버퍼에 바로 믹싱한다.
+        timing(SectionTiming)이 주어지면 비디오 섹션과 같은 시각에 효과음을 넣는다.
+        """
+        if timing is not None:
+            duration = timing.duration * 1000
+            question_at = timing.question_start * 1000
+            reveal_at = timing.reveal * 1000
+        else:
+            question_at = 0
+            reveal_at = 8000
+        length = self.section_length(duration, timing)
+        if timeline is None:
+            timeline = self._timeline(length)
+        end = offset + length
+
+        def at(ms):
+            return offset + self._to_samples(ms)
+
+        # 기본 배경음악 (볼륨 낮춤, 계획된 섹션이 더 길면 반복)
+        self._mix(timeline, self.load_bgm("quiz_bgm.mp3"), offset, end, gain_db=-20, loop=timing is not None)
+
+        # 질문 추가 (기본 0초)
+        self._mix(timeline, self.load_samples(tts_paths['question'], persist=False), at(question_at), end)
+
+        # 타이머 효과음 추가 (정답 공개 전 4초)
+        timer_tick = self.load_effect("timer_tick.mp3")
         for i in range(4):
-            final_audio = final_audio.overlay(timer_tick, position=4000 + (i * 1000))
-        
-        # 정답 효과음 및 나레이션 추가 (8초)
-        final_audio = final_audio.overlay(correct_sound, position=8000)
-        final_audio = final_audio.overlay(answer, position=8500)
-        
-        # 재미있는 사실 추가 (11초)
-        final_audio = final_audio.overlay(fact, position=11000)
+            self._mix(timeline, timer_tick, at(max(question_at, reveal_at - 4000 + (i * 1000))), end)
 
-        return final_audio
+        # 정답 효과음 및 나레이션 추가 (정답 공개, 기본 8초)
+        self._mix(timeline, self.load_effect("correct.mp3"), at(reveal_at), end)
+        self._mix(timeline, self.load_samples(tts_paths['answer'], persist=False), at(reveal_at + 500), end)
 
-    def create_full_video_audio(self, quiz_data_list):
-        """전체 비디오 오디오 생성"""
-        # 인트로 음악
-        intro = self.load_bgm("intro.mp3")[:8000]
-        
-        # 퀴즈 섹션 오디오
-        quiz_sections_audio = []
-        for quiz_data in quiz_data_list:
-            section_audio = self.create_quiz_section_audio(quiz_data['audio_paths'])
-            quiz_sections_audio.append(section_audio)
-        
-        # 아웃트로 음악
-        outro = self.load_bgm("outro.mp3")[:7000]
-        
-        # 전체 오디오 합치기
-        final_audio = intro
-        for section_audio in quiz_sections_audio:
-            final_audio += section_audio
-        final_audio += outro
+        # 재미있는 사실 추가 (공개 3초 후)
+        self._mix(timeline, self.load_samples(tts_paths['fact'], persist=False), at(reveal_at + 3000), end)
+
+        return timeline
+
+    def create_full_video_audio(self, quiz_data_list, video_timeline=None):
+        """전체 비디오 오디오 생성 (float32 샘플 배열)
 
-        return final_audio
\ No newline at end of file
+        video_timeline(VideoTimeline)이 주어지면 인트로/섹션/아웃트로 길이와
+        이벤트 시각을 비디오와 같은 계획에서 가져온다. 이때 각 구간은 에셋 길이와
+        상관없이 계획된 길이를 차지해서 (짧은 인트로/아웃트로는 무음으로 채움)
+        오디오가 비디오와 어긋나지 않는다.
+        """
+        intro = self.load_bgm("intro.mp3")
+        outro = self.load_bgm("outro.mp3")
+        if video_timeline is not None:
+            intro_length = self._to_samples(video_timeline.intro_duration * 1000)
+            outro_length = self._to_samples(video_timeline.outro_duration * 1000)
+            timings = video_timeline.sections
+        else:
+            intro_length = min(len(intro), self._to_samples(8000))
+            outro_length = min(len(outro), self._to_samples(7000))
+            timings = [None] * len(quiz_data_list)
+
+        section_lengths = [self.section_length(timing=timing) for timing in timings]
+
+        # 전체 길이만큼 한 번만 할당하고 각 구간을 제자리에 믹싱
+        timeline = self._timeline(intro_length + sum(section_lengths) + outro_length)
+        self._mix(timeline, intro, 0, intro_length)
+
+        offset = intro_length
+        for quiz_data, timing, section_length in zip(quiz_data_list, timings, section_lengths):
+            self.create_quiz_section_audio(
+                quiz_data['audio_paths'], timeline=timeline, offset=offset, timing=timing
+            )
+            offset += section_length
+
+        self._mix(timeline, outro, offset, offset + outro_length)
+        return timeline
+
+    def to_segment(self, timeline):
+        """샘플 배열을 AudioSegment로 변환 (클리핑 후 int16)"""
+        pcm = (np.clip(timeline, -1.0, 1.0) * 32767).astype(np.int16)
+        return AudioSegment(
+            data=pcm.tobytes(),
+            sample_width=2,
+            frame_rate=self.sample_rate,
+            channels=self.channels
+        )
+
+    def export(self, timeline, output_path, format="mp3"):
+        """최종 트랙을 한 번만 인코딩해서 저장"""
+        self.to_segment(timeline).export(output_path, format=format)
+        return output_path
@@ -0,0 +1,155 @@
+# src/audio/tts_service.py
+import os
+import wave
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+def quiz_narration_texts(quiz_data):
+    """퀴즈 하나의 나레이션 문장 (질문, 정답, 재미있는 사실)"""
+    return {
+        'question': quiz_data['question'],
+        'answer': f"The answer is {quiz_data.get('answer') or quiz_data['correct_answer']}",
+        'fact': quiz_data['fun_fact']
+    }
+
+
+class GTTSBackend:
+    """gTTS 백엔드"""
+    engine = "gtts"
+    extension = ".mp3"
+
+    def __init__(self, lang="en", slow=False):
+        self.lang = lang
+        self.slow = slow
+        self.voice = f"{lang}{'-slow' if slow else ''}"
+
+    def synthesize(self, text, output_path):
+        from gtts import gTTS
+        tts = gTTS(text=text, lang=self.lang, slow=self.slow)
+        tts.save(output_path)
+
+
+class GoogleCloudTTSBackend:
+    """Google Cloud Text-to-Speech 백엔드"""
+    engine = "google-cloud"
+    extension = ".mp3"
+
+    def __init__(self, language_code="en-US", voice_name="en-US-Neural2-D"):
+        from google.cloud import texttospeech
+        self._texttospeech = texttospeech
+        self.client = texttospeech.TextToSpeechClient()
+        self.voice = voice_name
+        self.voice_params = texttospeech.VoiceSelectionParams(
+            language_code=language_code,
+            name=voice_name,
+            ssml_gender=texttospeech.SsmlVoiceGender.FEMALE
+        )
+        self.audio_config = texttospeech.AudioConfig(
+            audio_encoding=texttospeech.AudioEncoding.MP3
+        )
+
+    def synthesize(self, text, output_path):
+        synthesis_input = self._texttospeech.SynthesisInput(text=text)
+        response = self.client.synthesize_speech(
+            input=synthesis_input,
+            voice=self.voice_params,
+            audio_config=self.audio_config
+        )
+        with open(output_path, "wb") as out:
+            out.write(response.audio_content)
+
+
+class StubTTSBackend:
+    """테스트용 로컬 백엔드: 단어 수에 비례하는 길이의 무음 WAV 생성"""
+    engine = "stub"
+    extension = ".wav"
+
+    def __init__(self, seconds_per_word=0.35, sample_rate=22050):
+        self.seconds_per_word = seconds_per_word
+        self.sample_rate = sample_rate
+        self.voice = "silence"
+        self.calls = 0
+
+    def synthesize(self, text, output_path):
+        self.calls += 1
+        duration = max(0.5, len(text.split()) * self.seconds_per_word)
+        with wave.open(output_path, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(b"\x00\x00" * int(duration * self.sample_rate))
+
+
+class TTSService:
+    """TTS 서비스
+
+    - 한 비디오의 모든 문장을 동시에 합성
+    - (엔진, 목소리, 텍스트) 해시로 오디오 파일을 캐시해서 같은 문장이나
+      실패 후 재실행 시 다시 합성하지 않음
+    """
+
+    def __init__(self, backend, cache_dir=os.path.join("assets", "audio", "tts_cache"), max_workers=4):
+        self.backend = backend
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """환경 변수(TTS_BACKEND: gtts, google-cloud, stub)로 생성"""
+        backend_name = os.getenv('TTS_BACKEND', 'gtts')
+        if backend_name == 'google-cloud':
+            backend = GoogleCloudTTSBackend()
+        elif backend_name == 'stub':
+            backend = StubTTSBackend()
+        else:
+            backend = GTTSBackend()
+        return cls(backend, cache_dir=os.getenv('TTS_CACHE_DIR', os.path.join("assets", "audio", "tts_cache")))
+
+    def cache_path(self, text):
+        key = f"{self.backend.engine}|{self.backend.voice}|{text}"
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}{self.backend.extension}")
+
+    def _lock_for(self, path):
+        with self._locks_guard:
+            return self._locks.setdefault(path, threading.Lock())
+
+    def synthesize(self, text):
+        """텍스트를 합성해서 캐시된 오디오 파일 경로 반환"""
+        path = self.cache_path(text)
+        with self._lock_for(path):
+            if os.path.exists(path):
+                return path
+
+            # 완성된 파일만 캐시에 보이도록 임시 파일에 쓴 뒤 교체
+            tmp_path = f"{path}.{threading.get_ident()}.tmp{self.backend.extension}"
+            try:
+                self.backend.synthesize(text, tmp_path)
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        return path
+
+    def synthesize_many(self, texts):
+        """여러 문장을 동시에 합성 (텍스트 -> 경로, 실패한 문장은 None)"""
+        unique_texts = list(dict.fromkeys(texts))
+        results = {}
+
+        def run(text):
+            try:
+                return self.synthesize(text)
+            except Exception as e:
+                print(f"Error generating TTS: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for text, path in zip(unique_texts, executor.map(run, unique_texts)):
+                results[text] = path
+        return results
@@ -0,0 +1,109 @@
+# src/batch.py
+import time
+import random
+import threading
+import traceback
+from src.pipeline import QuizPipeline
+from src.quiz_topics import QUIZ_TOPICS, get_topic
+
+
+class BatchPublisher:
+    """한 번의 실행으로 여러 비디오를 생성/업로드
+
+    QuizGenerator, YouTubeUploader와 렌더링 워커의 QuizVideoGenerator를
+    모든 항목에 재사용하고, 파이프라인으로 항목 간 단계를 겹쳐서 실행한다.
+    """
+
+    def __init__(self, quiz_gen, uploader, metadata_fn, inventory=None, quota=None,
+                 render_workers=1, upload=True, render_profile=None):
+        self.quiz_gen = quiz_gen
+        self.quota = quota
+        self.upload = upload
+        self._results = []
+        self._submitted_at = {}
+        self._done = threading.Condition()
+
+        self.pipeline = QuizPipeline(
+            quiz_gen,
+            uploader,
+            metadata_fn,
+            inventory=inventory,
+            render_workers=render_workers,
+            on_complete=self._on_complete,
+            upload=upload,
+            quota=quota,
+            render_profile=render_profile,
+            # --no-upload로 만든 비디오의 퀴즈는 나중에 다시 게시할 수 있도록 예약 해제
+            hold_rendered=False
+        )
+
+    def _on_complete(self, job):
+        job["finished_at"] = time.monotonic()
+        with self._done:
+            self._results.append(job)
+            self._done.notify_all()
+
+    def quota_remaining(self):
+        """오늘 남은 업로드 수 (장부가 없으면 None)"""
+        if self.quota is None:
+            return None
+        usage = self.quota.usage()
+        return max(0, usage["max_uploads"] - usage["uploads"] - usage["reserved"])
+
+    def pick_topics(self, count):
+        """주제 count개를 가능한 한 겹치지 않게 선택"""
+        topic_ids = list(QUIZ_TOPICS)
+        if count <= len(topic_ids):
+            return [get_topic(topic) for topic in random.sample(topic_ids, count)]
+        return [get_topic(random.choice(topic_ids)) for _ in range(count)]
+
+    def run(self, topics):
+        """topics(주제 정보 목록)를 모두 처리하고 결과 작업 목록 반환"""
+        if not topics:
+            print("No topics to publish")
+            return []
+
+        self._results = []
+        batch_started = time.monotonic()
+        
+        # 작업별로 LLM을 호출하지 않도록 부족한 주제를 먼저 동시에 생성
+        try:
+            self.quiz_gen.prefill_inventory(topics)
+        except Exception as e:
+            print(f"Error prefilling quiz inventory: {str(e)}")
+            traceback.print_exc()
+        
+        self.pipeline.start()
+        try:
+            for topic_info in topics:
+                submitted_at = time.monotonic()
+                job = self.pipeline.submit(topic_info)
+                self._submitted_at[job["id"]] = submitted_at
+
+            with self._done:
+                self._done.wait_for(lambda: len(self._results) >= len(topics))
+        finally:
+            self.pipeline.stop()
+
+        self.report(self._results, time.monotonic() - batch_started)
+        return self._results
+
+    def report(self, jobs, wall_time):
+        """항목별 / 전체 처리량 출력 (videos/hour)"""
+        print("\nBatch results:")
+        completed = 0
+        jobs = sorted(jobs, key=lambda job: self._submitted_at[job["id"]])
+        for index, job in enumerate(jobs, 1):
+            elapsed = max(job["finished_at"] - self._submitted_at[job["id"]], 0.001)
+            stages = ", ".join(f"{stage}={seconds:.1f}s" for stage, seconds in job.get("timings", {}).items())
+            if job["error"]:
+                status = f"FAILED ({job['error']})"
+            else:
+                completed += 1
+                status = job.get("video_id") or job.get("video_path")
+            print(f"[{index}/{len(jobs)}] {job['topic_info']['id']}: {status}")
+            print(f"    {elapsed:.1f}s ({3600 / elapsed:.1f} videos/hour) - {stages}")
+
+        rate = completed * 3600 / wall_time if wall_time > 0 else 0
+        print(f"\nCompleted {completed}/{len(jobs)} videos in {wall_time / 60:.1f} min "
+              f"({rate:.1f} videos/hour)")
@@ -0,0 +1,123 @@
+# src/job_queue.py
+import os
+import json
+import sqlite3
+from datetime import datetime
+
+# 파이프라인 단계별 체크포인트 (순서대로)
+# quiz: quiz_data_list, images: 이미지 디스크 캐시, tts: tts_paths,
+# silent_video: silent_video_path, final_video: video_path, upload: video_id
+STAGES = ["quiz", "images", "tts", "silent_video", "final_video", "upload"]
+
+
+class JobQueue:
+    """작업 상태와 단계별 결과를 저장하는 SQLite 작업 큐
+
+    각 단계가 끝날 때마다 작업 dict 전체를 저장하므로, 실패하거나 중단된
+    작업은 마지막으로 완료된 단계 다음부터 다시 실행된다.
+    업로드된 비디오 ID도 작업별 이력으로 남긴다 (일일 한도는 QuotaLedger가 관리).
+    """
+
+    def __init__(self, path=os.path.join("output", "jobs.sqlite3"), max_attempts=3):
+        self.path = path
+        self.max_attempts = max_attempts
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._create_schema()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _create_schema(self):
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    stages TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 1,
+                    error TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at);
+                CREATE TABLE IF NOT EXISTS uploads (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT,
+                    video_id TEXT NOT NULL,
+                    upload_date TEXT NOT NULL,
+                    uploaded_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_uploads_date ON uploads(upload_date);
+            """)
+        conn.close()
+
+    def _execute(self, query, params=()):
+        conn = self._connect()
+        try:
+            with conn:
+                return conn.execute(query, params).rowcount
+        finally:
+            conn.close()
+
+    def _save(self, job, status):
+        now = datetime.now().isoformat(timespec="seconds")
+        self._execute(
+            "UPDATE jobs SET status = ?, stages = ?, data = ?, attempts = ?, error = ?, updated_at = ? "
+            "WHERE id = ?",
+            (status, json.dumps(job["stages"]), json.dumps(job, ensure_ascii=False),
+             job["attempts"], job.get("error"), now, job["id"])
+        )
+
+    def create(self, job):
+        """새 작업 등록 (job은 id, stages를 가진 dict)"""
+        now = datetime.now().isoformat(timespec="seconds")
+        job["attempts"] = 1
+        self._execute(
+            "INSERT INTO jobs (id, status, stages, data, attempts, created_at, updated_at) "
+            "VALUES (?, 'running', ?, ?, 1, ?, ?)",
+            (job["id"], json.dumps(job["stages"]), json.dumps(job, ensure_ascii=False), now, now)
+        )
+
+    def checkpoint(self, job, stage):
+        """단계 완료 기록 (해당 단계의 결과는 job dict에 들어 있어야 함)"""
+        if stage not in job["stages"]:
+            job["stages"].append(stage)
+        self._save(job, "running")
+
+    def finish(self, job):
+        """작업 종료 기록 (job["error"]가 있으면 failed)"""
+        self._save(job, "failed" if job.get("error") else "done")
+
+    def can_retry(self, job):
+        return job["attempts"] < self.max_attempts
+
+    def retry(self, job):
+        """재시도 시작 (시도 횟수 증가, 에러 초기화)"""
+        job["attempts"] += 1
+        job["error"] = None
+        self._save(job, "running")
+
+    def unfinished(self):
+        """중단되었거나 재시도 가능한 실패 작업 목록 (오래된 순)"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT data FROM jobs WHERE status IN ('running', 'failed') AND attempts < ? "
+                "ORDER BY created_at",
+                (self.max_attempts,)
+            ).fetchall()
+        finally:
+            conn.close()
+
+        return [json.loads(row["data"]) for row in rows]
+
+    def record_upload(self, video_id, job_id=None):
+        now = datetime.now()
+        self._execute(
+            "INSERT INTO uploads (job_id, video_id, upload_date, uploaded_at) VALUES (?, ?, ?, ?)",
+            (job_id, video_id, now.date().isoformat(), now.isoformat(timespec="seconds"))
+        )
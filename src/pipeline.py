@@ -0,0 +1,319 @@
+# src/pipeline.py
+import os
+import queue
+import time
+import shutil
+import threading
+import traceback
+import uuid
+from datetime import datetime
+from src.video.generator import QuizVideoGenerator
+from src.video.image_fetcher import ImageFetcher
+from src.audio.tts_service import TTSService, quiz_narration_texts
+from src.video.render_profiles import get_render_profile
+from src.video.timeline import VideoTimeline
+
+
+class QuizPipeline:
+    """퀴즈 생성 → 에셋 수집 → 렌더링 → 업로드 단계별 파이프라인
+
+    단계마다 전용 워커 스레드와 크기가 제한된 입력 큐를 두어서
+    작업 N이 업로드되는 동안 작업 N+1이 렌더링될 수 있다.
+    렌더링 워커는 각자 QuizVideoGenerator와 출력 디렉토리를 가진다.
+
+    작업(job)은 dict이며 끝나면 on_complete(job)이 호출된다.
+    실패한 작업은 job["error"]에 메시지가, job["timings"]에는 단계별 소요 시간이 들어 있다.
+    job_queue(JobQueue)가 있으면 단계마다 결과를 저장하고, 이미 완료된
+    단계(job["stages"])는 resume() 시 건너뛴다.
+    quota(QuotaLedger)가 있으면 업로드 쿼터가 남을 때까지 업로드를 미룬다.
+    upload=False일 때 hold_rendered=True이면 렌더링된 작업의 퀴즈 예약을 유지하고
+    (렌더 버퍼처럼 나중에 업로드하는 경우), False이면 끝난 뒤 예약을 해제한다.
+    """
+
+    def __init__(self, quiz_gen, uploader, metadata_fn, inventory=None,
+                 output_path=os.path.join("output", "pipeline"),
+                 asset_workers=2, render_workers=1, upload_workers=1,
+                 queue_size=2, on_complete=None, upload=True, job_queue=None, quota=None,
+                 render_profile=None, hold_rendered=True):
+        self.quiz_gen = quiz_gen
+        self.uploader = uploader
+        self.metadata_fn = metadata_fn
+        self.inventory = inventory
+        self.output_path = output_path
+        self.job_dir = os.path.join(output_path, "jobs")
+        self.on_complete = on_complete
+        self.upload = upload
+        self.job_queue = job_queue
+        self.quota = quota
+        if upload:
+            # 업로드하는 파이프라인은 미리보기 프로필을 쓰지 않음
+            render_profile = render_profile or "publish"
+            if get_render_profile(render_profile).name == "draft":
+                raise ValueError("draft render profile is a preview and cannot be uploaded")
+        self.render_profile = render_profile
+        self.hold_rendered = hold_rendered
+        os.makedirs(self.job_dir, exist_ok=True)
+
+        self.image_fetcher = ImageFetcher.from_env()
+        self.tts = TTSService.from_env()
+
+        self.queues = {
+            "generate": queue.Queue(maxsize=queue_size),
+            "assets": queue.Queue(maxsize=queue_size),
+            "render": queue.Queue(maxsize=queue_size),
+            "upload": queue.Queue(maxsize=queue_size)
+        }
+        self.worker_counts = {
+            "generate": 1,
+            "assets": asset_workers,
+            "render": render_workers,
+            "upload": upload_workers if upload else 0
+        }
+
+        self._threads = []
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        self._idle = threading.Condition(self._in_flight_lock)
+
+    def start(self):
+        """단계별 워커 스레드 시작"""
+        for stage, count in self.worker_counts.items():
+            for index in range(count):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(stage, index),
+                    name=f"pipeline-{stage}-{index}",
+                    daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+        print(f"Pipeline started: {self.worker_counts}")
+        return self
+
+    def submit(self, topic_info, block=True):
+        """새 작업 등록 (block=False이고 생성 큐가 가득 차면 None 반환)"""
+        job = {
+            "id": f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}",
+            "topic_info": topic_info,
+            "stages": [],
+            "error": None
+        }
+        if self.job_queue is not None:
+            self.job_queue.create(job)
+        return self._enqueue(job, block)
+
+    def resume(self, job, block=True):
+        """저장된 작업을 마지막 완료 단계 다음부터 다시 실행"""
+        if self.job_queue is not None:
+            self.job_queue.retry(job)
+        if self.inventory is not None and job.get("quiz_data_list"):
+            # 중단된 동안 만료되지 않도록 예약 갱신
+            self.inventory.renew(job["quiz_data_list"])
+        print(f"Resuming job {job['id']} after stages: {job['stages']}")
+        return self._enqueue(job, block)
+
+    def _enqueue(self, job, block):
+        with self._in_flight_lock:
+            self._in_flight += 1
+
+        try:
+            self.queues["generate"].put(job, block=block)
+        except queue.Full:
+            job["error"] = "pipeline is full"
+            self._finish(job, notify=False)
+            print(f"Pipeline is full, skipping job for {job['topic_info']['id']}")
+            return None
+
+        print(f"Submitted job {job['id']} ({job['topic_info']['id']})")
+        return job
+
+    @property
+    def in_flight(self):
+        with self._in_flight_lock:
+            return self._in_flight
+
+    def wait_idle(self, timeout=None):
+        """진행 중인 작업이 모두 끝날 때까지 대기"""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._in_flight == 0, timeout=timeout)
+
+    def stop(self):
+        """워커 종료 (큐에 남은 작업을 처리한 뒤 종료)"""
+        for stage, count in self.worker_counts.items():
+            for _ in range(count):
+                self.queues[stage].put(None)
+            for thread in [t for t in self._threads if t.name.startswith(f"pipeline-{stage}-")]:
+                thread.join()
+        self._threads = []
+
+    def _worker(self, stage, index):
+        handler = getattr(self, f"_{stage}_stage")
+        state = {}
+        if stage == "render":
+            # 렌더링 워커마다 별도의 생성기와 출력 디렉토리
+            state["video_gen"] = QuizVideoGenerator(
+                output_path=os.path.join(self.output_path, f"render_{index}"),
+                render_profile=self.render_profile
+            )
+            # 렌더링 워커들이 배경 프레임 메모리 예산을 나눠 씀
+            state["video_gen"].frame_cache.workers *= self.worker_counts["render"]
+
+        stages = list(self.worker_counts)
+        next_stages = [s for s in stages[stages.index(stage) + 1:] if self.worker_counts[s] > 0]
+
+        while True:
+            job = self.queues[stage].get()
+            if job is None:
+                break
+            started = time.monotonic()
+            try:
+                handler(job, state)
+            except Exception as e:
+                print(f"Pipeline {stage} failed for job {job['id']}: {str(e)}")
+                traceback.print_exc()
+                job["error"] = f"{stage}: {str(e)}"
+            job.setdefault("timings", {})[stage] = round(time.monotonic() - started, 2)
+
+            if job["error"] or not next_stages:
+                self._finish(job)
+            else:
+                self.queues[next_stages[0]].put(job)
+
+    def _finish(self, job, notify=True):
+        if self.job_queue is not None:
+            self.job_queue.finish(job)
+        
+        # 다시 시도할 작업은 퀴즈 예약을 유지 (on_complete에서 resume()으로 다시 등록해야 함)
+        retryable = self.job_queue is not None and self.job_queue.can_retry(job)
+        failed = job["error"] and not retryable
+        # 업로드하지 않고 보관하지도 않는 렌더링 결과는 퀴즈를 다시 쓸 수 있게 함
+        not_published = not job["error"] and not self.upload and not self.hold_rendered
+        if (failed or not_published) and self.inventory is not None and job.get("quiz_data_list"):
+            self.inventory.release(job["quiz_data_list"])
+
+        # 콜백에서 in_flight를 보고 다음 작업을 등록할 수 있도록 먼저 감소
+        with self._idle:
+            self._in_flight -= 1
+
+        if notify and self.on_complete is not None:
+            try:
+                self.on_complete(job)
+            except Exception as e:
+                print(f"Error in pipeline callback: {str(e)}")
+
+        with self._idle:
+            self._idle.notify_all()
+
+    def _checkpoint(self, job, stage):
+        if stage not in job["stages"]:
+            job["stages"].append(stage)
+        if self.job_queue is not None:
+            self.job_queue.checkpoint(job, stage)
+
+    def _has_file(self, job, stage, key):
+        """단계가 완료되었고 결과 파일도 남아 있는지 확인"""
+        return stage in job["stages"] and os.path.exists(job.get(key) or "")
+
+    def _generate_stage(self, job, state):
+        if "quiz" in job["stages"]:
+            return
+        quiz_data_list = self.quiz_gen.get_quizzes(job["topic_info"], count=3)
+        if not quiz_data_list:
+            job["error"] = "generate: no quiz data"
+            return
+        job["quiz_data_list"] = quiz_data_list
+        self._checkpoint(job, "quiz")
+
+    def _assets_stage(self, job, state):
+        """이미지와 TTS(질문, 정답, 재미있는 사실)를 디스크 캐시에 미리 준비
+
+        렌더링 단계는 캐시에서 읽기만 하고 합성하지 않는다.
+        """
+        quiz_data_list = job["quiz_data_list"]
+        if "images" not in job["stages"]:
+            futures = self.image_fetcher.prefetch(
+                [quiz_data["image_keywords"] for quiz_data in quiz_data_list]
+            )
+        else:
+            futures = []
+
+        if "tts" not in job["stages"] or not all(
+            path and os.path.exists(path) for path in job.get("tts_paths", {}).values()
+        ):
+            job["tts_paths"] = self.tts.synthesize_many([
+                text for quiz_data in quiz_data_list
+                for text in quiz_narration_texts(quiz_data).values()
+            ])
+            self._checkpoint(job, "tts")
+
+        if futures:
+            for future in futures:
+                future.exception()
+            self._checkpoint(job, "images")
+
+    def _render_stage(self, job, state):
+        """무음 비디오 렌더링 후 오디오를 스트림 복사로 mux (단계별 체크포인트)"""
+        video_gen = state["video_gen"]
+        topic_info = job["topic_info"]
+        job_dir = os.path.join(self.job_dir, job["id"])
+        os.makedirs(job_dir, exist_ok=True)
+
+        if not self._has_file(job, "silent_video", "silent_video_path"):
+            silent_video = video_gen.create_video(
+                job["quiz_data_list"],
+                category=f"{topic_info['name']} Quiz"
+            )
+            if not silent_video:
+                job["error"] = "render: failed to generate video"
+                return
+            # 다음 작업이 같은 파일을 덮어쓰지 않도록 작업별 경로로 이동
+            job["silent_video_path"] = os.path.join(job_dir, "silent.mp4")
+            shutil.move(silent_video, job["silent_video_path"])
+            # 오디오가 비디오와 같은 계획을 쓰도록 (재개할 때도) 저장
+            job["timeline"] = video_gen.timeline.to_dict()
+            self._checkpoint(job, "silent_video")
+
+        if not self._has_file(job, "final_video", "video_path"):
+            timeline = job.get("timeline")
+            final_video = video_gen.add_background_music(
+                job["silent_video_path"], job["quiz_data_list"],
+                timeline=VideoTimeline.from_dict(timeline) if timeline else None
+            )
+            if not final_video:
+                job["error"] = "render: failed to add audio"
+                return
+            job["video_path"] = os.path.join(job_dir, "final.mp4")
+            shutil.move(final_video, job["video_path"])
+            self._checkpoint(job, "final_video")
+
+        print(f"Rendered job {job['id']}: {job['video_path']}")
+
+    def _upload_stage(self, job, state):
+        if "upload" in job["stages"]:
+            return
+        if self.quota is not None and not self.quota.can_upload():
+            # 업로드 시점에 실패하지 않도록 다음 가능 시각까지 대기
+            next_slot = self.quota.next_slot()
+            print(f"Upload quota used up, job {job['id']} waits until {next_slot.strftime('%Y-%m-%d %H:%M')}")
+            time.sleep(max(0, (next_slot - datetime.now()).total_seconds()))
+            if self.inventory is not None:
+                self.inventory.renew(job["quiz_data_list"])
+        title, description = self.metadata_fn(job["quiz_data_list"], job["topic_info"])
+        print(f"\nUploading job {job['id']}: {title}")
+        video_id = self.uploader.upload_video(
+            job["video_path"],
+            title=title,
+            description=description,
+            privacy_status="public"
+        )
+        if not video_id:
+            job["error"] = "upload: failed to upload video"
+            return
+
+        job["video_id"] = video_id
+        if self.job_queue is not None:
+            self.job_queue.record_upload(video_id, job["id"])
+        self._checkpoint(job, "upload")
+        if self.inventory is not None:
+            self.inventory.mark_published(job["quiz_data_list"], video_id)
+        print(f"Video uploaded successfully! ID: {video_id}")
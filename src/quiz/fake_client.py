@@ -0,0 +1,116 @@
+# src/quiz/fake_client.py
+import re
+import json
+import time
+import asyncio
+from types import SimpleNamespace
+
+
+def _fake_quiz_response(kwargs):
+    """프롬프트의 주제/개수로 유효한 퀴즈 JSON 응답 생성"""
+    prompt = kwargs["messages"][-1]["content"]
+    if isinstance(prompt, list):
+        prompt = " ".join(block.get("text", "") for block in prompt)
+
+    match = re.search(r"Create (\d+) quiz questions about ([\w\s]+?)\.", prompt)
+    count = int(match.group(1)) if match else 3
+    topic = match.group(2).strip() if match else "general knowledge"
+
+    quizzes = [{
+        "question": f"Offline {topic} question number {i + 1}?",
+        "correct_answer": f"{topic.title()} {i + 1}",
+        "wrong_answers": [f"Wrong {i + 1}A", f"Wrong {i + 1}B", f"Wrong {i + 1}C"],
+        "fun_fact": f"This is an offline fun fact about {topic}.",
+        "image_keywords": f"{topic} illustration"
+    } for i in range(count)]
+
+    text = json.dumps(quizzes, indent=2)
+    return SimpleNamespace(
+        content=[SimpleNamespace(type="text", text=text)],
+        usage=SimpleNamespace(
+            input_tokens=len(prompt.split()),
+            output_tokens=len(text.split()),
+            cache_creation_input_tokens=0,
+            cache_read_input_tokens=0
+        ),
+        model=kwargs.get("model"),
+        stop_reason="end_turn"
+    )
+
+
+class _FakeMessageStream:
+    """messages.stream() 컨텍스트 매니저 흉내 (text_stream, get_final_message, close)"""
+
+    def __init__(self, response, chunk_size, latency):
+        self._response = response
+        self.closed = False
+        self._chunk_size = chunk_size
+        self._latency = latency
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    @property
+    def text_stream(self):
+        text = self._response.content[0].text
+        for start in range(0, len(text), self._chunk_size):
+            time.sleep(self._latency)
+            yield text[start:start + self._chunk_size]
+
+    @property
+    def current_message_snapshot(self):
+        return self._response
+
+    def get_final_message(self):
+        return self._response
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeMessages:
+    def __init__(self, owner):
+        self.owner = owner
+
+    def create(self, **kwargs):
+        self.owner.requests.append(kwargs)
+        return _fake_quiz_response(kwargs)
+
+    def stream(self, **kwargs):
+        self.owner.requests.append(kwargs)
+        return _FakeMessageStream(_fake_quiz_response(kwargs), self.owner.chunk_size, self.owner.latency)
+
+
+class _FakeAsyncMessages:
+    def __init__(self, owner):
+        self.owner = owner
+
+    async def create(self, **kwargs):
+        self.owner.requests.append(kwargs)
+        await asyncio.sleep(self.owner.latency)
+        return _fake_quiz_response(kwargs)
+
+
+class FakeAnthropicClient:
+    """오프라인 테스트용 Anthropic 클라이언트 (messages.create, messages.stream 지원)
+
+    stream은 응답 텍스트를 chunk_size 글자씩, 조각마다 latency초 간격으로 보낸다.
+    """
+
+    def __init__(self, chunk_size=16, latency=0.0):
+        self.chunk_size = chunk_size
+        self.latency = latency
+        self.requests = []
+        self.messages = _FakeMessages(self)
+
+
+class FakeAsyncAnthropicClient:
+    """오프라인 테스트용 AsyncAnthropic 클라이언트"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.requests = []
+        self.messages = _FakeAsyncMessages(self)
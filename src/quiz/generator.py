@@ -1,62 +1,249 @@
-import json
-from anthropic import Anthropic
-import re
+import time
+import asyncio
+from anthropic import Anthropic, AsyncAnthropic
+from src.quiz.stream_parser import QuizStreamParser
+from src.quiz.metrics import LLMUsageLog
 
 class QuizGenerator:
-    def __init__(self, api_key):
-        self.client = Anthropic(api_key=api_key)
+    MODEL = "claude-3-opus-20240229"
+
+    # 모든 호출에 같은 형식 지시문을 시스템 프롬프트로 보냄
+    # (Opus의 최소 캐시 길이 1024 토큰보다 짧아서 프롬프트 캐싱은 쓰지 않음)
+    INSTRUCTIONS = """You write quiz questions for short quiz videos.
+IMPORTANT: Return only a JSON array, no additional text or explanations.
+
+Format each question exactly like this example:
+[
+    {
+        "question": "What is this unique sport feature shown in the image?",
+        "correct_answer": "Answer",
+        "wrong_answers": ["Wrong1", "Wrong2", "Wrong3"],
+        "fun_fact": "Interesting fact about this answer",
+        "image_keywords": "specific descriptive keywords for image search"
+    }
+]
+
+Each question should be visual and interesting.
+Include specific image_keywords that will help find a relevant image.
+Ensure all answers are clear and concise."""
+
+    def __init__(self, api_key, client=None, async_client=None, inventory=None, usage_log=None):
+        self.api_key = api_key
+        self.client = client or Anthropic(api_key=api_key)
+        self.async_client = async_client
+        self.inventory = inventory
+        self.usage_log = usage_log or LLMUsageLog.from_env()
+
+    def _build_request(self, topic, count, prompt=None):
+        """Messages API 요청 파라미터 생성 (고정 지시문 + 주제별 프롬프트)"""
+        content = f"Create {count} quiz questions about {topic}."
+        if prompt:
+            content = f"{content}\n{prompt}"
+
+        return {
+            "model": self.MODEL,
+            "max_tokens": 2000,
+            "temperature": 0.7,
+            "system": self.INSTRUCTIONS,
+            "messages": [{
+                "role": "user",
+                "content": content
+            }]
+        }
+
+    def _parse_response(self, response, count):
+        """응답에서 퀴즈 목록 추출 (실패 시 None)"""
+        content = str(response.content[0].text if isinstance(response.content, list) else response.content)
+
+        # 배열의 각 객체를 따로 파싱하고 검증
+        parser = QuizStreamParser()
+        quiz_data = [quiz for quiz in parser.feed(content) if self._validate_quiz_data([quiz])]
+        if quiz_data:
+            print(f"Generated {len(quiz_data)} valid quizzes")
+            return quiz_data[:count]
+
+        print(f"No valid quiz in response ({len(content)} chars)")
+        return None
 
     def generate_quiz(self, topic, count=5, prompt=None):
         try:
-            prompt = f"""Create {count} quiz questions about {topic}.
-            IMPORTANT: Return only a JSON array, no additional text or explanations.
-            
-            Format each question exactly like this example:
-            [
-                {{
-                    "question": "What is this unique sport feature shown in the image?",
-                    "correct_answer": "Answer",
-                    "wrong_answers": ["Wrong1", "Wrong2", "Wrong3"],
-                    "fun_fact": "Interesting fact about this answer",
-                    "image_keywords": "specific descriptive keywords for image search"
-                }}
-            ]
-            
-            Each question should be visual and interesting.
-            Include specific image_keywords that will help find a relevant image.
-            Ensure all answers are clear and concise."""
-
-            response = self.client.messages.create(
-                model="claude-3-opus-20240229",
-                max_tokens=2000,
-                temperature=0.7,
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }]
-            )
-
-            # JSON 배열 추출 시도
-            content = str(response.content[0].text if isinstance(response.content, list) else response.content)
-            print(f"Response content: {content}")
-
-            # JSON 배열 찾기
-            json_match = re.search(r'\[\s*{.*?}\s*\]', content, re.DOTALL)
-            if json_match:
-                try:
-                    quiz_data = json.loads(json_match.group())
-                    if self._validate_quiz_data(quiz_data):
-                        print(f"Generated valid quiz data: {quiz_data}")
-                        return quiz_data[:count]
-                except json.JSONDecodeError as e:
-                    print(f"JSON parsing error: {str(e)}")
-                    
+            started = time.monotonic()
+            response = self.client.messages.create(**self._build_request(topic, count, prompt))
+            self.usage_log.record(topic, "create", self.MODEL, getattr(response, "usage", None),
+                                  time.monotonic() - started)
+
+            quiz_data = self._parse_response(response, count)
+            if quiz_data:
+                if self.inventory is not None:
+                    self.inventory.add_quizzes(topic, quiz_data)
+                return quiz_data
+
             return self._get_fallback_quiz(count)
 
         except Exception as e:
             print(f"Error generating quiz: {str(e)}")
             return self._get_fallback_quiz(count)
 
+    def stream_quiz(self, topic, count=5, prompt=None, extra=2):
+        """스트리밍 API로 생성하면서 검증된 퀴즈를 완성되는 순서대로 반환
+
+        인벤토리가 있으면 새로 저장되어 예약된 퀴즈만 반환하고(중복은 건너뜀),
+        mark_published/release로 결과를 기록해야 한다. 중복을 대비해서 extra개를
+        더 요청하고 count개가 모이면 나머지 응답을 기다리지 않고 스트림을 닫는다.
+        실패하거나 하나도 받지 못하면 인벤토리가 있을 때는 아무것도 반환하지 않고
+        (기본 퀴즈를 게시하지 않도록), 없을 때만 기본 퀴즈를 반환한다.
+        """
+        yielded = 0
+        duplicates = 0
+        requested = count + extra if self.inventory is not None else count
+        try:
+            parser = QuizStreamParser()
+            started = time.monotonic()
+            first_token = None
+            with self.client.messages.stream(**self._build_request(topic, requested, prompt)) as stream:
+                for text in stream.text_stream:
+                    if first_token is None:
+                        first_token = time.monotonic() - started
+                    for quiz in parser.feed(text):
+                        if yielded >= count:
+                            break
+                        if not self._validate_quiz_data([quiz]):
+                            print(f"Skipping invalid quiz: {quiz}")
+                            continue
+                        if self.inventory is not None and not self.inventory.add_quizzes(
+                            topic, [quiz], reserve=True
+                        ):
+                            # 이미 있는 퀴즈 (inventory_id 없음) - 다음 퀴즈를 계속 읽음
+                            duplicates += 1
+                            continue
+                        yielded += 1
+                        print(f"Streamed quiz {yielded}/{count}")
+                        yield quiz
+                    if parser.done or yielded >= count:
+                        break
+
+                if parser.done:
+                    # 배열이 끝났으면 남은 이벤트는 짧음 - 최종 사용량 기록
+                    mode = "stream"
+                    usage = getattr(stream.get_final_message(), "usage", None)
+                else:
+                    # 필요한 만큼 받았으면 남은(여분) 퀴즈 생성을 기다리지 않고 닫음
+                    # (사용량은 지금까지 받은 스냅샷 기준)
+                    mode = "stream_closed"
+                    snapshot = getattr(stream, "current_message_snapshot", None)
+                    usage = getattr(snapshot, "usage", None)
+                    stream.close()
+            self.usage_log.record(topic, mode, self.MODEL, usage, time.monotonic() - started, first_token)
+        except Exception as e:
+            print(f"Error streaming quiz: {str(e)}")
+
+        if yielded:
+            return
+        if duplicates:
+            print(f"All {duplicates} streamed quizzes for {topic} were duplicates")
+        elif self.inventory is not None:
+            print(f"No quiz streamed for {topic}")
+        else:
+            print("No quiz streamed, using fallback quiz")
+            yield from self._get_fallback_quiz(count)
+
+    def get_quizzes(self, topic_info, count=3, stream=False, attempts=2):
+        """인벤토리의 미사용 퀴즈를 우선 사용하고 부족하면 새로 생성
+
+        stream=True이면 부족할 때 stream_quiz 이터레이터를 반환한다.
+        새로 생성해도 중복을 제외한 퀴즈가 부족하면 attempts번까지 다시 생성하고,
+        그래도 부족하면 중복을 다시 게시하지 않도록 None을 반환한다.
+        """
+        if self.inventory is None:
+            if stream:
+                return self.stream_quiz(topic_info['id'], count=count, prompt=topic_info['prompt'])
+            return self.generate_quiz(topic_info['id'], count=count, prompt=topic_info['prompt'])
+
+        quizzes = self.inventory.pick_unused(topic_info['id'], count)
+        if len(quizzes) >= count:
+            print(f"Using {count} unused quizzes from inventory for {topic_info['id']}")
+            return quizzes
+        self.inventory.release(quizzes)
+
+        if stream:
+            return self.stream_quiz(topic_info['id'], count=count, prompt=topic_info['prompt'])
+
+        # 새로 생성한 퀴즈는 중복을 제외하고 인벤토리에 저장됨
+        for attempt in range(1, attempts + 1):
+            self.generate_quiz(topic_info['id'], count=count, prompt=topic_info['prompt'])
+            quizzes = self.inventory.pick_unused(topic_info['id'], count)
+            if len(quizzes) >= count:
+                return quizzes
+            self.inventory.release(quizzes)
+            print(f"Not enough new unique quizzes for {topic_info['id']} (attempt {attempt}/{attempts})")
+
+        print(f"Giving up on {topic_info['id']}: generated quizzes were duplicates")
+        return None
+
+    def prefill_inventory(self, topics, per_video=3, max_concurrency=4):
+        """topics(작업별 주제 정보, 중복 가능)에 필요한 만큼 인벤토리가 부족한 주제를
+        generate_batch로 한 번에 동시 생성 (작업마다 LLM을 따로 호출하지 않도록)"""
+        if self.inventory is None:
+            return {}
+
+        topic_infos = {topic_info['id']: topic_info for topic_info in topics}
+        needed = {}
+        for topic_info in topics:
+            needed[topic_info['id']] = needed.get(topic_info['id'], 0) + per_video
+        missing = {
+            topic_id: count - self.inventory.count_unused(topic_id)
+            for topic_id, count in needed.items()
+        }
+        missing = {topic_id: count for topic_id, count in missing.items() if count > 0}
+        if not missing:
+            print("Inventory already has enough quizzes for all topics")
+            return {}
+
+        print(f"Prefilling inventory for {len(missing)} topics: {', '.join(missing)}")
+        return self.generate_batch(
+            [topic_infos[topic_id] for topic_id in missing],
+            count=max(missing.values()),
+            max_concurrency=max_concurrency
+        )
+
+    def generate_batch(self, topics, count=3, max_concurrency=4):
+        """여러 주제의 퀴즈를 동시에 생성해서 인벤토리에 저장
+
+        topics는 get_topic()/get_all_topics()가 반환하는 주제 정보 목록이다.
+        주제 ID -> 검증된 퀴즈 목록 (실패한 주제는 제외)을 반환한다.
+        """
+        return asyncio.run(self.generate_batch_async(topics, count, max_concurrency))
+
+    async def generate_batch_async(self, topics, count=3, max_concurrency=4):
+        client = self.async_client or AsyncAnthropic(api_key=self.api_key)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def generate(topic_info):
+            async with semaphore:
+                try:
+                    started = time.monotonic()
+                    response = await client.messages.create(
+                        **self._build_request(topic_info['id'], count, topic_info['prompt'])
+                    )
+                    self.usage_log.record(topic_info['id'], "batch", self.MODEL,
+                                          getattr(response, "usage", None), time.monotonic() - started)
+                except Exception as e:
+                    print(f"Error generating quiz for {topic_info['id']}: {str(e)}")
+                    return topic_info['id'], None
+            return topic_info['id'], self._parse_response(response, count)
+
+        results = {}
+        for topic_id, quiz_data in await asyncio.gather(*(generate(t) for t in topics)):
+            if not quiz_data:
+                print(f"No valid quiz generated for {topic_id}")
+                continue
+            results[topic_id] = quiz_data
+            if self.inventory is not None:
+                self.inventory.add_quizzes(topic_id, quiz_data)
+
+        print(f"Batch generated quizzes for {len(results)}/{len(topics)} topics")
+        return results
+
     def _validate_quiz_data(self, quiz_data):
         """퀴즈 데이터 유효성 검사"""
         if not isinstance(quiz_data, list):
@@ -0,0 +1,209 @@
+# src/quiz/inventory.py
+import os
+import re
+import json
+import sqlite3
+import hashlib
+from datetime import datetime, timedelta
+
+
+def normalize_text(text):
+    """중복 비교용 텍스트 정규화 (소문자, 구두점 제거, 공백 정리)"""
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+def answers_hash(quiz):
+    """정답 + 오답 집합의 해시 (순서 무관)"""
+    answers = sorted(normalize_text(a) for a in [quiz["correct_answer"]] + list(quiz["wrong_answers"]))
+    return hashlib.sha1("\n".join(answers).encode("utf-8")).hexdigest()
+
+
+class QuizInventory:
+    """퀴즈 보관소 (SQLite)
+
+    정규화된 질문과 답안 집합 해시에 인덱스를 두어 중복 확인과
+    "주제 X의 미사용 퀴즈 N개" 조회가 이력 크기와 무관하게 빠르다.
+    예약은 reservation_timeout(초)이 지나면 만료되므로 중단된 프로세스의 예약이
+    영구히 남지 않는다. 오래 보관하는 작업(렌더 버퍼 등)은 renew()로 갱신한다.
+    """
+
+    def __init__(self, path=os.path.join("output", "quiz_inventory.sqlite3"), reservation_timeout=48 * 3600):
+        self.path = path
+        self.reservation_timeout = reservation_timeout
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._create_schema()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _create_schema(self):
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS quizzes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    topic TEXT NOT NULL,
+                    question_key TEXT NOT NULL,
+                    answers_hash TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    reserved_at TEXT,
+                    published_at TEXT,
+                    video_id TEXT
+                );
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_quizzes_question ON quizzes(question_key);
+                CREATE INDEX IF NOT EXISTS idx_quizzes_answers ON quizzes(answers_hash);
+                CREATE INDEX IF NOT EXISTS idx_quizzes_unused
+                    ON quizzes(topic, published_at, reserved_at, id);
+            """)
+        conn.close()
+
+    def _find_duplicate(self, conn, quiz):
+        return conn.execute(
+            "SELECT id FROM quizzes WHERE question_key = ? OR answers_hash = ? LIMIT 1",
+            (normalize_text(quiz["question"]), answers_hash(quiz))
+        ).fetchone()
+
+    def is_duplicate(self, quiz):
+        """같은 질문 또는 같은 답안 집합의 퀴즈가 이미 있는지 확인"""
+        conn = self._connect()
+        try:
+            return self._find_duplicate(conn, quiz) is not None
+        finally:
+            conn.close()
+
+    def add_quizzes(self, topic_id, quizzes, reserve=False):
+        """검증된 퀴즈 저장 (중복은 건너뜀), 추가된 개수 반환
+
+        reserve=True이면 바로 사용할 퀴즈로 예약하고 inventory_id를 채운다.
+        """
+        created_at = datetime.now().isoformat(timespec="seconds")
+        reserved_at = created_at if reserve else None
+        added = 0
+        conn = self._connect()
+        try:
+            with conn:
+                for quiz in quizzes:
+                    if self._find_duplicate(conn, quiz) is not None:
+                        print(f"Skipping duplicate quiz: {quiz['question']}")
+                        continue
+                    data = {k: v for k, v in quiz.items() if k != "inventory_id"}
+                    cursor = conn.execute(
+                        "INSERT INTO quizzes (topic, question_key, answers_hash, data, created_at, reserved_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (topic_id, normalize_text(quiz["question"]), answers_hash(quiz),
+                         json.dumps(data, ensure_ascii=False), created_at, reserved_at)
+                    )
+                    if reserve:
+                        quiz["inventory_id"] = cursor.lastrowid
+                    added += 1
+        finally:
+            conn.close()
+        return added
+
+    def _reservation_cutoff(self):
+        """이 시각보다 오래된 예약은 만료된 것으로 취급"""
+        return (datetime.now() - timedelta(seconds=self.reservation_timeout)).isoformat(timespec="seconds")
+
+    def pick_unused(self, topic_id, count, reserve=True):
+        """주제의 미사용 퀴즈를 오래된 순서로 count개 선택
+
+        reserve=True이면 다른 작업이 같은 퀴즈를 고르지 않도록 예약한다.
+        반환되는 퀴즈에는 inventory_id가 들어 있다.
+        """
+        conn = self._connect()
+        try:
+            conn.isolation_level = None
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT id, data FROM quizzes "
+                "WHERE topic = ? AND published_at IS NULL AND (reserved_at IS NULL OR reserved_at < ?) "
+                "ORDER BY id LIMIT ?",
+                (topic_id, self._reservation_cutoff(), count)
+            ).fetchall()
+            if reserve and rows:
+                reserved_at = datetime.now().isoformat(timespec="seconds")
+                conn.executemany(
+                    "UPDATE quizzes SET reserved_at = ? WHERE id = ?",
+                    [(reserved_at, row["id"]) for row in rows]
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        quizzes = []
+        for row in rows:
+            quiz = json.loads(row["data"])
+            quiz["inventory_id"] = row["id"]
+            quizzes.append(quiz)
+        return quizzes
+
+    def release(self, quizzes):
+        """예약 해제 (렌더링/업로드 실패 시)"""
+        ids = [(q["inventory_id"],) for q in quizzes if q.get("inventory_id")]
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "UPDATE quizzes SET reserved_at = NULL WHERE id = ? AND published_at IS NULL", ids
+                )
+        finally:
+            conn.close()
+
+    def renew(self, quizzes):
+        """예약 시각 갱신 (오래 걸리는 작업이 예약을 잃지 않도록)"""
+        reserved_at = datetime.now().isoformat(timespec="seconds")
+        ids = [(reserved_at, q["inventory_id"]) for q in quizzes if q.get("inventory_id")]
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "UPDATE quizzes SET reserved_at = ? WHERE id = ? AND published_at IS NULL", ids
+                )
+        finally:
+            conn.close()
+
+    def mark_published(self, quizzes, video_id):
+        """업로드된 퀴즈 기록"""
+        published_at = datetime.now().isoformat(timespec="seconds")
+        ids = [(published_at, video_id, q["inventory_id"]) for q in quizzes if q.get("inventory_id")]
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "UPDATE quizzes SET published_at = ?, video_id = ? WHERE id = ?", ids
+                )
+        finally:
+            conn.close()
+
+    def count_unused(self, topic_id=None):
+        """미사용 퀴즈 개수 (topic_id 지정 시 해당 주제만)"""
+        query = ("SELECT COUNT(*) FROM quizzes "
+                 "WHERE published_at IS NULL AND (reserved_at IS NULL OR reserved_at < ?)")
+        params = (self._reservation_cutoff(),)
+        if topic_id is not None:
+            query += " AND topic = ?"
+            params += (topic_id,)
+        conn = self._connect()
+        try:
+            return conn.execute(query, params).fetchone()[0]
+        finally:
+            conn.close()
+
+    def load(self, topic_id=None):
+        """저장된 퀴즈 목록 (topic_id 지정 시 해당 주제만)"""
+        query = "SELECT data FROM quizzes"
+        params = ()
+        if topic_id is not None:
+            query += " WHERE topic = ?"
+            params = (topic_id,)
+        conn = self._connect()
+        try:
+            return [json.loads(row["data"]) for row in conn.execute(query + " ORDER BY id", params)]
+        finally:
+            conn.close()
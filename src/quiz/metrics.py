@@ -0,0 +1,67 @@
+# src/quiz/metrics.py
+import os
+import json
+import threading
+from datetime import datetime
+
+
+class LLMUsageLog:
+    """LLM 호출별 토큰 사용량과 지연 시간을 JSONL로 기록"""
+
+    def __init__(self, path=os.path.join("output", "metrics", "llm_usage.jsonl")):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """환경 변수(LLM_METRICS_LOG)로 생성"""
+        return cls(os.getenv('LLM_METRICS_LOG', os.path.join("output", "metrics", "llm_usage.jsonl")))
+
+    def record(self, topic, mode, model, usage, latency, ttft=None):
+        """호출 하나의 사용량 기록 (usage는 응답의 usage 객체, 없으면 None)"""
+        entry = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "topic": topic,
+            "mode": mode,
+            "model": model,
+            "input_tokens": getattr(usage, "input_tokens", 0) or 0,
+            "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+            "cache_creation_input_tokens": getattr(usage, "cache_creation_input_tokens", 0) or 0,
+            "cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", 0) or 0,
+            "latency": round(latency, 3),
+            "ttft": round(ttft, 3) if ttft is not None else None
+        }
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+        print(f"LLM usage ({mode}, {topic}): in={entry['input_tokens']} out={entry['output_tokens']} "
+              f"cache_write={entry['cache_creation_input_tokens']} cache_read={entry['cache_read_input_tokens']} "
+              f"latency={entry['latency']}s")
+        return entry
+
+    def summary(self):
+        """기록 전체의 합계"""
+        totals = {
+            "calls": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 0,
+            "latency": 0.0
+        }
+        if not os.path.exists(self.path):
+            return totals
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                totals["calls"] += 1
+                for key in totals:
+                    if key != "calls":
+                        totals[key] += entry.get(key) or 0
+        return totals
@@ -0,0 +1,76 @@
+# src/quiz/stream_parser.py
+import json
+
+
+class QuizStreamParser:
+    """JSON 배열 응답을 조각 단위로 받아서 완성된 객체부터 꺼내는 증분 파서
+
+    배열 앞뒤의 설명 문장은 무시하고, 문자열/이스케이프를 추적하면서
+    최상위 객체가 닫히는 즉시 json.loads로 변환한다.
+    """
+
+    def __init__(self):
+        self.done = False
+        self.errors = 0
+        self._in_array = False
+        self._parsed_any = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._current = []
+
+    def feed(self, text):
+        """텍스트 조각을 추가하고 새로 완성된 객체 목록 반환"""
+        items = []
+        for ch in text:
+            if self.done:
+                break
+
+            if not self._in_array:
+                if ch == '[':
+                    self._in_array = True
+                continue
+
+            if self._depth == 0:
+                # 배열 원소 사이 (공백, 쉼표, 다음 객체 또는 배열 끝)
+                if ch == '{':
+                    self._depth = 1
+                    self._current = [ch]
+                elif ch == ']':
+                    self.done = self._parsed_any
+                    self._in_array = False
+                elif not ch.isspace() and ch != ',' and not self._parsed_any:
+                    # 설명 문장 안의 '['였음: 다음 '['를 다시 찾음
+                    self._in_array = False
+                continue
+
+            self._current.append(ch)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in '{[':
+                self._depth += 1
+            elif ch in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    item = self._decode(''.join(self._current))
+                    self._current = []
+                    if item is not None:
+                        items.append(item)
+        return items
+
+    def _decode(self, text):
+        try:
+            item = json.loads(text)
+        except ValueError as e:
+            print(f"JSON parsing error: {str(e)}")
+            self.errors += 1
+            return None
+        self._parsed_any = True
+        return item
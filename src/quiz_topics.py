@@ -19,13 +19,21 @@ QUIZ_TOPICS = {
     "ancient_civilizations": "Ancient Civilizations"
 }
 
-def get_random_topic():
-    """랜덤한 퀴즈 주제 선택"""
-    topic, topic_name = random.choice(list(QUIZ_TOPICS.items()))
+def get_topic(topic):
+    """주제 ID로 퀴즈 주제 정보 생성"""
+    topic_name = QUIZ_TOPICS[topic]
     return {
         "id": topic,
         "name": topic_name,
         "prompt": f"Create interesting and educational quiz questions about {topic_name}. "
                  f"Questions should be diverse and not too similar to each other. "
                  f"Include surprising and engaging fun facts that viewers might not know."
-    }
\ No newline at end of file
+    }
+
+def get_all_topics():
+    """모든 퀴즈 주제 정보"""
+    return [get_topic(topic) for topic in QUIZ_TOPICS]
+
+def get_random_topic():
+    """랜덤한 퀴즈 주제 선택"""
+    return get_topic(random.choice(list(QUIZ_TOPICS)))
@@ -0,0 +1,133 @@
+# src/render_buffer.py
+import os
+import json
+import shutil
+import threading
+from datetime import datetime
+
+
+class RenderBuffer:
+    """업로드 대기 중인 완성 비디오 보관소
+
+    항목마다 비디오 파일({id}.mp4)과 상태 파일({id}.json)을 둔다.
+    상태 파일은 임시 파일에 쓴 뒤 os.replace로 교체하고 비디오를 옮긴 다음에만
+    만들기 때문에, 재시작 시 상태 파일이 있는 항목은 항상 완성된 비디오를 가진다.
+
+    상태: ready (업로드 대기) → uploading → published (published/ 폴더로 이동)
+    """
+
+    def __init__(self, buffer_dir=os.path.join("output", "buffer"), target_size=2):
+        self.buffer_dir = buffer_dir
+        self.target_size = target_size
+        self.published_dir = os.path.join(buffer_dir, "published")
+        self._lock = threading.Lock()
+        os.makedirs(self.published_dir, exist_ok=True)
+        self.recover()
+
+    def _state_path(self, entry_id):
+        return os.path.join(self.buffer_dir, f"{entry_id}.json")
+
+    def _write_state(self, entry):
+        path = self._state_path(entry["id"])
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _read_entries(self):
+        entries = []
+        for name in os.listdir(self.buffer_dir):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.buffer_dir, name), "r", encoding="utf-8") as f:
+                    entries.append(json.load(f))
+            except (OSError, ValueError) as e:
+                print(f"Skipping unreadable buffer entry {name}: {e}")
+        return sorted(entries, key=lambda entry: entry["created_at"])
+
+    def recover(self):
+        """재시작 시 정리: 업로드 중이던 항목은 대기 상태로, 상태 파일 없는 비디오는 삭제"""
+        with self._lock:
+            entries = self._read_entries()
+            known_videos = set()
+            for entry in entries:
+                if entry["state"] == "uploading":
+                    print(f"Recovering interrupted upload: {entry['id']}")
+                    entry["state"] = "ready"
+                    self._write_state(entry)
+                if entry["state"] == "ready" and not os.path.exists(entry["video_path"]):
+                    print(f"Buffered video missing, dropping entry: {entry['id']}")
+                    os.remove(self._state_path(entry["id"]))
+                    entry["state"] = "missing"
+                known_videos.add(os.path.basename(entry["video_path"]))
+
+            for name in os.listdir(self.buffer_dir):
+                if name.endswith(".tmp") or (name.endswith(".mp4") and name not in known_videos):
+                    os.remove(os.path.join(self.buffer_dir, name))
+
+            ready = sum(1 for entry in entries if entry["state"] == "ready")
+            print(f"Render buffer: {ready} ready videos in {self.buffer_dir}")
+
+    def add(self, video_path, topic_info, quiz_data_list, title, description):
+        """렌더링된 비디오를 버퍼로 옮기고 항목 추가"""
+        entry_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+        buffered_video = os.path.join(self.buffer_dir, f"{entry_id}.mp4")
+        shutil.move(video_path, buffered_video)
+
+        entry = {
+            "id": entry_id,
+            "state": "ready",
+            "created_at": datetime.now().isoformat(),
+            "video_path": buffered_video,
+            "topic_info": topic_info,
+            "quiz_data_list": quiz_data_list,
+            "title": title,
+            "description": description,
+            "video_id": None
+        }
+        with self._lock:
+            self._write_state(entry)
+        print(f"Buffered video {entry_id} ({self.ready_count()}/{self.target_size})")
+        return entry
+
+    def ready_entries(self):
+        """업로드 대기 중인 항목 목록 (오래된 순)"""
+        with self._lock:
+            return [entry for entry in self._read_entries() if entry["state"] == "ready"]
+
+    def ready_count(self):
+        with self._lock:
+            return sum(1 for entry in self._read_entries() if entry["state"] == "ready")
+
+    def take(self):
+        """가장 오래된 대기 항목을 업로드 중으로 표시하고 반환 (없으면 None)"""
+        with self._lock:
+            for entry in self._read_entries():
+                if entry["state"] == "ready":
+                    entry["state"] = "uploading"
+                    self._write_state(entry)
+                    return entry
+        return None
+
+    def restore(self, entry):
+        """업로드 실패 시 다시 대기 상태로"""
+        with self._lock:
+            entry["state"] = "ready"
+            self._write_state(entry)
+
+    def complete(self, entry, video_id):
+        """업로드 완료 기록 (상태 파일은 published/로 옮기고 비디오 파일 삭제)"""
+        with self._lock:
+            entry["state"] = "published"
+            entry["video_id"] = video_id
+            entry["published_at"] = datetime.now().isoformat()
+            self._write_state(entry)
+            os.replace(
+                self._state_path(entry["id"]),
+                os.path.join(self.published_dir, f"{entry['id']}.json")
+            )
+            if os.path.exists(entry["video_path"]):
+                os.remove(entry["video_path"])
@@ -1,13 +1,17 @@
 # src/scheduler.py
 import os
-import time
 import schedule
+import threading
 import traceback
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from src.quiz.generator import QuizGenerator
-from src.video.generator import QuizVideoGenerator
+from src.quiz.inventory import QuizInventory
+from src.pipeline import QuizPipeline
+from src.render_buffer import RenderBuffer
+from src.job_queue import JobQueue
 from src.utils.youtube_uploader import YouTubeUploader
+from src.utils.quota_ledger import QuotaLedger
 from src.quiz_topics import get_random_topic
 
 # YouTube API 관련 imports
@@ -27,14 +31,51 @@ class QuizScheduler:
         self.setup_directories()
         
         # 인스턴스 생성
-        self.quiz_gen = QuizGenerator(os.getenv("CLAUDE_API_KEY"))
-        self.video_gen = QuizVideoGenerator()
-        self.youtube_uploader = YouTubeUploader()
+        self.inventory = QuizInventory()
+        self.quiz_gen = QuizGenerator(os.getenv("CLAUDE_API_KEY"), inventory=self.inventory)
+        # 일일 업로드 제한과 API 쿼터는 다른 프로세스와 공유하는 장부로 관리
+        self.quota = QuotaLedger.from_env()
+        self.MAX_DAILY_UPLOADS = self.quota.max_daily_uploads
+        self.youtube_uploader = YouTubeUploader(quota_ledger=self.quota)
         
-        # 일일 업로드 제한 관리
-        self.daily_upload_count = 0
-        self.last_upload_date = None
-        self.MAX_DAILY_UPLOADS = 5
+        # 작업 단계별 체크포인트와 업로드 기록 (재시작해도 유지)
+        self.job_queue = JobQueue()
+        self._upload_lock = threading.Lock()
+        
+        # 미리 렌더링해 둘 비디오 수 (0이면 예약 시각에 생성부터 시작)
+        buffer_size = int(os.getenv('RENDER_BUFFER_SIZE', '0'))
+        self.render_buffer = RenderBuffer(target_size=buffer_size) if buffer_size > 0 else None
+        self._pending_slots = 0
+        
+        # 디스패처를 깨우거나 종료할 때 사용
+        # (파이프라인 완료 콜백이 쓰므로 파이프라인 시작 전에 만들어야 함)
+        self.wakeup = threading.Event()
+        self.stopped = False
+        
+        # 재시도 가능한 실패 작업 (재시도 시각, 작업) - 퀴즈 예약을 유지한 채 다음 틱에 재개
+        self.retry_delay = int(os.getenv('JOB_RETRY_DELAY', '300'))
+        self._retry_jobs = []
+        self._retry_lock = threading.Lock()
+        
+        # 생성 → 에셋 → 렌더링 → 업로드 파이프라인
+        # (버퍼 모드에서는 렌더링까지만 하고 업로드는 예약 시각에 버퍼에서)
+        self.pipeline = QuizPipeline(
+            self.quiz_gen,
+            self.youtube_uploader,
+            self.generate_metadata,
+            inventory=self.inventory,
+            render_workers=int(os.getenv('PIPELINE_RENDER_WORKERS', '1')),
+            upload_workers=int(os.getenv('PIPELINE_UPLOAD_WORKERS', '1')),
+            on_complete=self.on_job_complete,
+            upload=self.render_buffer is None,
+            job_queue=self.job_queue,
+            quota=self.quota,
+            # 업로드용 렌더링은 RENDER_PROFILE 환경 변수와 무관하게 publish
+            render_profile="publish"
+        ).start()
+        
+        # 중단된 작업은 완료된 단계 다음부터 백그라운드에서 재개
+        threading.Thread(target=self.resume_jobs, daemon=True).start()
 
     def setup_directories(self):
         """필요한 디렉토리 생성"""
@@ -47,13 +88,19 @@ class QuizScheduler:
         for directory in directories:
             os.makedirs(directory, exist_ok=True)
 
-    def reset_daily_count(self):
-        """매일 자정에 업로드 카운트 초기화"""
-        current_date = datetime.now().date()
-        if self.last_upload_date != current_date:
-            self.daily_upload_count = 0
-            self.last_upload_date = current_date
-            print(f"Reset daily upload count for {current_date}")
+    def upload_slot_available(self, pending=0):
+        """업로드 쿼터가 남았는지 확인 (없으면 다음 가능 시각 출력)"""
+        if self.quota.can_upload(pending):
+            return True
+        next_slot = self.quota.next_slot(pending)
+        print(f"Daily upload limit ({self.MAX_DAILY_UPLOADS}) reached. "
+              f"Next upload slot: {next_slot.strftime('%Y-%m-%d %H:%M')}")
+        return False
+
+    def resume_jobs(self):
+        """이전 실행에서 끝나지 않은 작업 재개"""
+        for job in self.job_queue.unfinished():
+            self.pipeline.resume(job)
 
     def generate_metadata(self, quiz_data_list, topic_info):
         """메타데이터 생성"""
@@ -74,80 +121,165 @@ class QuizScheduler:
         return title, description
         
     def create_and_upload_quiz(self):
-        """퀴즈 생성 및 업로드 작업"""
+        """퀴즈 작업을 파이프라인에 등록 (렌더링/업로드는 백그라운드에서 진행)"""
         try:
             current_time = datetime.now()
             print(f"\nStarting scheduled task at {current_time.strftime('%Y-%m-%d %H:%M:%S')}")
             
-            # 일일 업로드 카운트 체크
-            self.reset_daily_count()
-            if self.daily_upload_count >= self.MAX_DAILY_UPLOADS:
-                print(f"Daily upload limit ({self.MAX_DAILY_UPLOADS}) reached. Skipping upload.")
+            if self.render_buffer is not None:
+                self.publish_from_buffer()
+                return
+            
+            # 일일 업로드 쿼터 체크 (진행 중인 작업 포함)
+            if not self.upload_slot_available(pending=self.pipeline.in_flight):
                 return
             
             # 랜덤 주제 선택
             topic_info = get_random_topic()
             print(f"Selected topic: {topic_info['name']} ({topic_info['id']})")
             
-            # 퀴즈 생성
-            quiz_data_list = self.quiz_gen.generate_quiz(
-                topic_info['id'],
-                count=3,
-                prompt=topic_info['prompt']
-            )
-            
-            if not quiz_data_list:
-                print("Failed to generate quiz data")
-                return
-            
-            # 비디오 생성
-            print("Creating video...")
-            video_file = self.video_gen.create_video(quiz_data_list, category=f"{topic_info['name']} Quiz")
-            
-            if not video_file:
-                print("Failed to generate video")
-                return
+            # 이전 작업의 업로드가 길어져도 예약 시각을 놓치지 않도록 대기 없이 등록
+            self.pipeline.submit(topic_info, block=False)
                 
-            print(f"Video created: {video_file}")
-            
-            # 배경음악과 TTS 추가
-            print("\nAdding background music and TTS...")
-            final_video = self.video_gen.add_background_music(video_file, quiz_data_list)
-            
-            if not final_video:
-                print("Failed to add audio")
-                return
-                
-            print(f"Final video with audio created: {final_video}")
-            
-            # 일일 업로드 제한 체크
-            if self.daily_upload_count >= self.MAX_DAILY_UPLOADS:
-                print("Daily upload limit reached. Skipping upload.")
-                return
-            
-            # 메타데이터 생성 및 업로드
-            title, description = self.generate_metadata(quiz_data_list, topic_info)
-            print("\nUploading to YouTube...")
-            print(f"Title: {title}")
-            print(f"Description:\n{description}")
-            
+        except Exception as e:
+            print(f"Error during scheduled task: {str(e)}")
+            traceback.print_exc()
+
+    def on_job_complete(self, job):
+        """파이프라인 작업 완료 콜백 (워커 스레드에서 호출됨)"""
+        if job["error"]:
+            print(f"Job {job['id']} failed: {job['error']}")
+            if self.job_queue.can_retry(job):
+                # 파이프라인이 예약을 유지했으므로 재시작을 기다리지 않고 이 프로세스에서 재시도
+                self.schedule_retry(job)
+            return
+        
+        if self.render_buffer is not None:
+            # 렌더링된 비디오를 메타데이터와 함께 버퍼에 보관
+            title, description = self.generate_metadata(job["quiz_data_list"], job["topic_info"])
+            self.render_buffer.add(
+                job["video_path"], job["topic_info"], job["quiz_data_list"], title, description
+            )
+            with self._upload_lock:
+                slot_waiting = self._pending_slots > 0
+                if slot_waiting:
+                    self._pending_slots -= 1
+            if slot_waiting:
+                # 버퍼가 비어 있던 예약 시각의 업로드를 지금 처리
+                self.publish_from_buffer()
+            self.wakeup.set()
+            return
+        
+        usage = self.quota.usage()
+        print(f"Daily uploads: {usage['uploads']}/{usage['max_uploads']}")
+
+    def schedule_retry(self, job):
+        """실패한 작업을 retry_delay초 뒤 디스패처 틱에서 재개하도록 등록"""
+        retry_at = datetime.now() + timedelta(seconds=self.retry_delay)
+        print(f"Retrying job {job['id']} at {retry_at.strftime('%H:%M:%S')} "
+              f"(attempt {job['attempts'] + 1}/{self.job_queue.max_attempts})")
+        with self._retry_lock:
+            self._retry_jobs.append((retry_at, job))
+        self.wakeup.set()
+
+    def retry_failed_jobs(self):
+        """재시도 시각이 된 작업을 파이프라인에 다시 등록"""
+        now = datetime.now()
+        with self._retry_lock:
+            due = [job for retry_at, job in self._retry_jobs if retry_at <= now]
+            self._retry_jobs = [(retry_at, job) for retry_at, job in self._retry_jobs if retry_at > now]
+        for job in due:
+            if self.pipeline.resume(job, block=False) is None and self.job_queue.can_retry(job):
+                # 파이프라인이 가득 찼으면 다음 틱에 다시 시도
+                self.schedule_retry(job)
+
+    def next_retry_seconds(self):
+        """가장 가까운 재시도까지 남은 시간 (없으면 None)"""
+        with self._retry_lock:
+            if not self._retry_jobs:
+                return None
+            next_retry = min(retry_at for retry_at, _ in self._retry_jobs)
+        return max(0, (next_retry - datetime.now()).total_seconds())
+
+    def publish_from_buffer(self):
+        """버퍼의 가장 오래된 완성 비디오를 업로드 (예약 시각에 호출)"""
+        if not self.upload_slot_available():
+            return
+        
+        entry = self.render_buffer.take()
+        if entry is None:
+            print("Render buffer is empty, the next rendered video will be uploaded right away")
+            with self._upload_lock:
+                self._pending_slots += 1
+            self.refill_buffer()
+            return
+        
+        print(f"\nUploading buffered video {entry['id']}...")
+        print(f"Title: {entry['title']}")
+        try:
             video_id = self.youtube_uploader.upload_video(
-                final_video,
-                title=title,
-                description=description,
+                entry["video_path"],
+                title=entry["title"],
+                description=entry["description"],
                 privacy_status="public"
             )
-            
-            if video_id:
-                self.daily_upload_count += 1
-                print(f"Video uploaded successfully! ID: {video_id}")
-                print(f"Daily uploads: {self.daily_upload_count}/{self.MAX_DAILY_UPLOADS}")
-            else:
-                print("Failed to upload video")
-                
         except Exception as e:
-            print(f"Error during scheduled task: {str(e)}")
-            traceback.print_exc()
+            print(f"Error uploading buffered video: {str(e)}")
+            video_id = None
+        
+        if not video_id:
+            print("Failed to upload video, keeping it in the buffer")
+            self.render_buffer.restore(entry)
+            return
+        
+        self.render_buffer.complete(entry, video_id)
+        self.job_queue.record_upload(video_id)
+        self.inventory.mark_published(entry["quiz_data_list"], video_id)
+        print(f"Video uploaded successfully! ID: {video_id}")
+        self.wakeup.set()
+
+    def refill_buffer(self):
+        """버퍼가 목표 개수보다 부족하면 렌더링 작업 추가 (대기 시간에 호출)"""
+        if self.render_buffer is None:
+            return
+        
+        # 버퍼에서 기다리는 비디오의 퀴즈 예약이 만료되지 않도록 갱신
+        self.inventory.renew([
+            quiz for entry in self.render_buffer.ready_entries() for quiz in entry["quiz_data_list"]
+        ])
+        
+        # 재시도를 기다리는 작업도 곧 버퍼를 채우므로 제외
+        with self._retry_lock:
+            retrying = len(self._retry_jobs)
+        missing = (self.render_buffer.target_size + self._pending_slots
+                   - self.render_buffer.ready_count() - self.pipeline.in_flight - retrying)
+        for _ in range(missing):
+            topic_info = get_random_topic()
+            print(f"Refilling render buffer: {topic_info['name']} ({topic_info['id']})")
+            if self.pipeline.submit(topic_info, block=False) is None:
+                break
+
+    def run_dispatcher(self):
+        """다음 예약 시각까지 정확히 대기하다가 작업 실행 (stop() 전까지 반복)
+
+        버퍼 모드에서는 깨어날 때마다 (작업 완료 포함) 버퍼를 다시 채우고,
+        재시도 시각이 된 실패 작업을 다시 등록한다.
+        """
+        while not self.stopped:
+            schedule.run_pending()
+            self.retry_failed_jobs()
+            self.refill_buffer()
+            
+            waits = [seconds for seconds in (schedule.idle_seconds(), self.next_retry_seconds())
+                     if seconds is not None]
+            timeout = max(0, min(waits)) if waits else None
+            self.wakeup.wait(timeout)
+            self.wakeup.clear()
+
+    def stop(self):
+        """디스패처 종료"""
+        self.stopped = True
+        self.wakeup.set()
 
 def run_scheduler():
     scheduler = QuizScheduler()
@@ -159,12 +291,13 @@ def run_scheduler():
     print("Scheduler started...")
     print("Scheduled upload times: 08:50, 16:00")
     print(f"Maximum daily uploads: {scheduler.MAX_DAILY_UPLOADS}")
+    if scheduler.render_buffer is not None:
+        print(f"Render buffer size: {scheduler.render_buffer.target_size}")
     
     try:
-        while True:
-            schedule.run_pending()
-            time.sleep(60)
+        scheduler.run_dispatcher()
     except KeyboardInterrupt:
         print("\nScheduler stopped by user")
+        print(f"Jobs still in progress: {scheduler.pipeline.in_flight}")
     except Exception as e:
-        print(f"\nScheduler stopped due to error: {str(e)}")
\ No newline at end of file
+        print(f"\nScheduler stopped due to error: {str(e)}")
@@ -0,0 +1,182 @@
+# src/utils/quota_ledger.py
+import os
+import json
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# API 호출별 (쿼터 종류, 단위 비용)
+UNIT_COSTS = {
+    "videos.insert": ("youtube", 1600),
+    "channels.list": ("youtube", 1),
+    "customsearch": ("customsearch", 1)
+}
+
+
+class QuotaLedger:
+    """업로드 수와 API 쿼터 사용량을 날짜별로 기록하는 공유 장부
+
+    JSON 파일 하나를 파일 잠금(fcntl, Windows에서는 msvcrt)으로 보호하므로
+    main.py, 스케줄러, 워커 프로세스가 같은 예산을 나눠 쓴다.
+    업로드는 reserve_upload()로 자리를 먼저 잡고 commit/cancel로 확정한다.
+    """
+
+    def __init__(self, path=os.path.join("output", "quota_ledger.json"), max_daily_uploads=5,
+                 daily_limits=None, reservation_timeout=2 * 3600, keep_days=7):
+        self.path = path
+        self.lock_path = f"{path}.lock"
+        self.max_daily_uploads = max_daily_uploads
+        self.daily_limits = daily_limits or {"youtube": 10000, "customsearch": 100}
+        self.reservation_timeout = reservation_timeout
+        self.keep_days = keep_days
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    @classmethod
+    def from_env(cls):
+        """환경 변수 설정으로 생성"""
+        return cls(
+            os.getenv('QUOTA_LEDGER_PATH', os.path.join("output", "quota_ledger.json")),
+            max_daily_uploads=int(os.getenv('MAX_DAILY_UPLOADS', '5')),
+            daily_limits={
+                "youtube": int(os.getenv('YOUTUBE_DAILY_UNITS', '10000')),
+                "customsearch": int(os.getenv('CUSTOMSEARCH_DAILY_QUERIES', '100'))
+            }
+        )
+
+    @contextmanager
+    def _locked(self):
+        """잠금을 잡고 장부를 읽어서 넘겨주고, 블록이 끝나면 저장"""
+        with open(self.lock_path, "a+b") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                data = self._read()
+                yield data
+                self._prune(data)
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=2)
+                os.replace(tmp_path, self.path)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {"days": {}}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"days": {}}
+
+    def _prune(self, data):
+        cutoff = (datetime.now().date() - timedelta(days=self.keep_days)).isoformat()
+        for day in [day for day in data["days"] if day < cutoff]:
+            del data["days"][day]
+
+    def _day(self, data, date=None):
+        key = (date or datetime.now().date()).isoformat()
+        day = data["days"].setdefault(key, {"uploads": [], "reservations": {}, "units": {}})
+        # 오래된 예약(프로세스 종료 등)은 자동으로 해제
+        now = time.time()
+        for token, reserved_at in list(day["reservations"].items()):
+            if now - reserved_at > self.reservation_timeout:
+                del day["reservations"][token]
+        return day
+
+    def _has_room(self, day, operation, count=1):
+        quota, cost = UNIT_COSTS[operation]
+        limit = self.daily_limits.get(quota)
+        return limit is None or day["units"].get(quota, 0) + cost * count <= limit
+
+    def record(self, operation, count=1):
+        """API 호출 사용량 기록"""
+        quota, cost = UNIT_COSTS[operation]
+        with self._locked() as data:
+            units = self._day(data)["units"]
+            units[quota] = units.get(quota, 0) + cost * count
+
+    def can_spend(self, operation, count=1):
+        with self._locked() as data:
+            return self._has_room(self._day(data), operation, count)
+
+    def reserve_upload(self):
+        """업로드 자리 예약 (가능하면 토큰, 아니면 None)"""
+        with self._locked() as data:
+            day = self._day(data)
+            used = len(day["uploads"]) + len(day["reservations"])
+            if day.get("exhausted") or used >= self.max_daily_uploads:
+                return None
+            if not self._has_room(day, "videos.insert", 1 + len(day["reservations"])):
+                return None
+            token = uuid.uuid4().hex
+            day["reservations"][token] = time.time()
+            return token
+
+    def commit_upload(self, token, video_id):
+        """예약한 업로드 완료 기록 (videos.insert 단위 포함)"""
+        with self._locked() as data:
+            day = self._day(data)
+            day["reservations"].pop(token, None)
+            day["uploads"].append({"video_id": video_id, "time": datetime.now().isoformat(timespec="seconds")})
+            units = day["units"]
+            units["youtube"] = units.get("youtube", 0) + UNIT_COSTS["videos.insert"][1]
+
+    def cancel_upload(self, token, units_spent=False):
+        """예약 취소 (실패한 insert 요청도 쿼터를 쓰므로 units_spent로 기록)"""
+        with self._locked() as data:
+            day = self._day(data)
+            day["reservations"].pop(token, None)
+            if units_spent:
+                units = day["units"]
+                units["youtube"] = units.get("youtube", 0) + UNIT_COSTS["videos.insert"][1]
+
+    def mark_exhausted(self):
+        """YouTube가 업로드 한도 초과를 알린 경우 오늘 남은 업로드를 모두 막음"""
+        with self._locked() as data:
+            day = self._day(data)
+            day["exhausted"] = True
+
+    def usage(self, date=None):
+        """날짜별 사용량 요약"""
+        with self._locked() as data:
+            day = self._day(data, date)
+            uploads = self.max_daily_uploads if day.get("exhausted") else len(day["uploads"])
+            return {
+                "uploads": uploads,
+                "reserved": len(day["reservations"]),
+                "max_uploads": self.max_daily_uploads,
+                "units": dict(day["units"]),
+                "limits": dict(self.daily_limits)
+            }
+
+    def can_upload(self, pending=0):
+        """지금 업로드할 수 있는지 (pending: 아직 예약하지 않은 진행 중 작업 수)"""
+        usage = self.usage()
+        if usage["uploads"] + usage["reserved"] + pending >= self.max_daily_uploads:
+            return False
+        youtube_limit = self.daily_limits.get("youtube")
+        needed = UNIT_COSTS["videos.insert"][1] * (1 + usage["reserved"] + pending)
+        return youtube_limit is None or usage["units"].get("youtube", 0) + needed <= youtube_limit
+
+    def next_slot(self, pending=0, now=None):
+        """다음 업로드가 가능한 시각 (지금 가능하면 now)"""
+        now = now or datetime.now()
+        if self.can_upload(pending):
+            return now
+        # 사용량은 날짜 단위로 초기화됨
+        return datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
@@ -0,0 +1,71 @@
+# src/utils/upload_session.py
+import os
+import json
+import time
+import hashlib
+import threading
+
+
+class UploadSessionStore:
+    """재개 가능한 업로드 세션(URI, 전송한 바이트 수)을 디스크에 저장
+
+    같은 파일(경로, 크기, 수정 시간)과 제목으로 다시 업로드하면 저장된 세션을
+    이어서 사용한다. 세션 URI는 일정 시간이 지나면 만료되므로 max_age가 지난
+    세션은 버린다.
+    """
+
+    def __init__(self, path=os.path.join("output", "upload_sessions.json"), max_age=24 * 3600):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def key_for(self, file_path, title):
+        stat = os.stat(file_path)
+        key = f"{os.path.abspath(file_path)}|{stat.st_size}|{int(stat.st_mtime)}|{title}"
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, sessions):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(sessions, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get(self, key):
+        """저장된 세션 반환 (없거나 만료되었으면 None)"""
+        with self._lock:
+            session = self._read().get(key)
+        if session is None:
+            return None
+        if time.time() - session["created_at"] > self.max_age:
+            print("Saved upload session expired, starting a new one")
+            self.remove(key)
+            return None
+        return session
+
+    def save(self, key, uri, progress, file_path=None):
+        with self._lock:
+            sessions = self._read()
+            session = sessions.get(key) or {"created_at": time.time(), "file_path": file_path}
+            if session.get("uri") != uri:
+                session["created_at"] = time.time()
+            session["uri"] = uri
+            session["progress"] = progress
+            session["updated_at"] = time.time()
+            sessions[key] = session
+            self._write(sessions)
+
+    def remove(self, key):
+        with self._lock:
+            sessions = self._read()
+            if sessions.pop(key, None) is not None:
+                self._write(sessions)
@@ -2,16 +2,27 @@
 import os
 import time
 import pickle
+import random
 import traceback
+import httplib2
 from datetime import datetime, timedelta
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
 from googleapiclient.errors import HttpError
+from src.utils.upload_session import UploadSessionStore
+from src.utils.quota_ledger import QuotaLedger
+
+# 재개 가능한 업로드 청크는 256KB의 배수여야 함
+CHUNK_UNIT = 256 * 1024
+MIN_CHUNK_SIZE = CHUNK_UNIT
+MAX_CHUNK_SIZE = 32 * 1024 * 1024
+RETRIABLE_STATUS_CODES = [500, 502, 503, 504]
+RETRIABLE_EXCEPTIONS = (ConnectionError, TimeoutError, httplib2.HttpLib2Error)
 
 class YouTubeUploader:
-   def __init__(self, max_retries=3, retry_delay=5):
+   def __init__(self, max_retries=3, retry_delay=5, session_store=None, quota_ledger=None):
        # API 인증 관련
        self.credentials = None
        self.youtube = None
@@ -24,37 +35,83 @@ class YouTubeUploader:
        self.api_name = "youtube"
        self.api_version = "v3"
        
+       # 만료 전에 미리 토큰 갱신, 채널 ID는 TTL 동안 재사용
+       self.token_refresh_margin = timedelta(minutes=5)
+       self.channel_id = None
+       self.channel_id_fetched_at = None
+       self.channel_id_ttl = timedelta(hours=24)
+       
        # 재시도 설정
        self.max_retries = max_retries
        self.retry_delay = retry_delay
+       self.max_chunk_retries = 8
+       self.max_backoff = 64
        
-       # 일일 업로드 제한 관리
-       self.daily_upload_count = 0
-       self.last_upload_date = None
-       self.MAX_DAILY_UPLOADS = 5
-       self.UPLOAD_RESET_HOUR = 0
-
-   def _check_upload_limit(self):
-       """일일 업로드 제한 체크"""
-       current_time = datetime.now()
+       # 재개 가능한 업로드 세션 저장소와 처리량 기반 청크 크기
+       self.session_store = session_store or UploadSessionStore()
+       self.chunk_size = 1024 * 1024
+       self.chunk_target_seconds = 8
        
-       if (self.last_upload_date is None or 
-           self.last_upload_date.date() != current_time.date()):
-           print("Resetting daily upload count")
-           self.daily_upload_count = 0
-           self.last_upload_date = current_time
-           return True
-           
-       if self.daily_upload_count >= self.MAX_DAILY_UPLOADS:
-           next_reset = (current_time + timedelta(days=1)).replace(
-               hour=self.UPLOAD_RESET_HOUR, minute=0, second=0
-           )
-           wait_seconds = (next_reset - current_time).total_seconds()
+       # 일일 업로드 제한 관리 (프로세스 간 공유 장부)
+       self.quota = quota_ledger or QuotaLedger.from_env()
+
+   def _reserve_upload(self):
+       """일일 업로드 제한 체크 후 업로드 자리 예약 (불가능하면 None)"""
+       token = self.quota.reserve_upload()
+       if token is None:
+           current_time = datetime.now()
+           usage = self.quota.usage()
+           wait_seconds = (self.quota.next_slot() - current_time).total_seconds()
            print(f"Daily upload limit reached. Next reset in {wait_seconds/3600:.1f} hours")
-           print(f"Current uploads today: {self.daily_upload_count}/{self.MAX_DAILY_UPLOADS}")
+           print(f"Current uploads today: {usage['uploads']}/{usage['max_uploads']}, "
+                 f"YouTube units: {usage['units'].get('youtube', 0)}/{usage['limits'].get('youtube')}")
+       return token
+
+   def _backoff(self, retry_count):
+       """지수 백오프 + full jitter 대기"""
+       delay = random.uniform(0, min(self.max_backoff, 2 ** retry_count))
+       print(f"Retrying chunk in {delay:.1f} seconds...")
+       time.sleep(delay)
+
+   def _adapt_chunk_size(self, media, sent_bytes, elapsed):
+       """측정한 처리량으로 청크 한 개가 약 chunk_target_seconds 걸리도록 조정"""
+       if sent_bytes <= 0 or elapsed <= 0:
+           return
+       throughput = sent_bytes / elapsed
+       target = int(throughput * self.chunk_target_seconds) // CHUNK_UNIT * CHUNK_UNIT
+       # 한 번에 최대 2배까지만 늘림
+       chunk_size = max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, target, media._chunksize * 2))
+       if chunk_size != media._chunksize:
+           print(f"Upload throughput {throughput / 1024 / 1024:.2f} MB/s, chunk size {chunk_size // 1024} KB")
+       media._chunksize = chunk_size
+       self.chunk_size = chunk_size
+
+   def _save_credentials(self, creds):
+       print("Saving token...")
+       with open('token.pickle', 'wb') as token:
+           pickle.dump(creds, token)
+
+   def _needs_refresh(self, creds):
+       """토큰이 없거나 만료 margin 이내이면 True"""
+       if not creds.valid:
+           return True
+       if creds.expiry is None:
            return False
+       return creds.expiry - datetime.utcnow() < self.token_refresh_margin
+
+   def ensure_authenticated(self):
+       """생성된 클라이언트를 재사용하고 토큰이 곧 만료되면 미리 갱신"""
+       if self.youtube is None or self.credentials is None:
+           return self.authenticate()
            
-       return True
+       if self._needs_refresh(self.credentials):
+           if not self.credentials.refresh_token:
+               return self.authenticate()
+           print("Refreshing access token before expiry...")
+           # 클라이언트가 같은 credentials 객체를 쓰므로 다시 build할 필요 없음
+           self.credentials.refresh(Request())
+           self._save_credentials(self.credentials)
+       return self.youtube
 
    def authenticate(self):
        """YouTube API 인증 (재시도 로직 포함)"""
@@ -66,8 +123,8 @@ class YouTubeUploader:
                    with open('token.pickle', 'rb') as token:
                        creds = pickle.load(token)
                        
-               if not creds or not creds.valid:
-                   if creds and creds.expired and creds.refresh_token:
+               if not creds or self._needs_refresh(creds):
+                   if creds and creds.refresh_token:
                        print("Refreshing access token...")
                        creds.refresh(Request())
                    else:
@@ -76,10 +133,9 @@ class YouTubeUploader:
                            'client_secrets.json', self.scopes)
                        creds = flow.run_local_server(port=0)
                        
-                   print("Saving token...")
-                   with open('token.pickle', 'wb') as token:
-                       pickle.dump(creds, token)
+                   self._save_credentials(creds)
                        
+               self.credentials = creds
                self.youtube = build(self.api_name, self.api_version, credentials=creds)
                print("YouTube API authentication successful")
                return self.youtube
@@ -94,24 +150,30 @@ class YouTubeUploader:
                    raise
 
    def get_channel_id(self):
-       """브랜드 계정 채널 ID 가져오기 (재시도 로직 포함)"""
+       """브랜드 계정 채널 ID 가져오기 (TTL 동안 캐시, 재시도 로직 포함)"""
+       if (self.channel_id is not None and
+           datetime.now() - self.channel_id_fetched_at < self.channel_id_ttl):
+           return self.channel_id
+           
        for attempt in range(self.max_retries):
            try:
+               self.quota.record("channels.list")
                channels = self.youtube.channels().list(
                    mine=True,
                    part='id,snippet'
                ).execute()
                
-               print("Available channels:")
-               for channel in channels.get('items', []):
-                   print(f"Channel Title: {channel['snippet']['title']}")
-                   print(f"Channel ID: {channel['id']}")
-                   
                for channel in channels.get('items', []):
                    if '1 minute knowledge' in channel['snippet']['title'].lower():
-                       print(f"Found target channel: {channel['snippet']['title']}")
+                       print(f"Found target channel: {channel['snippet']['title']} ({channel['id']})")
+                       self.channel_id = channel['id']
+                       self.channel_id_fetched_at = datetime.now()
                        return channel['id']
                        
+               # 찾지 못한 경우에만 채널 목록 출력
+               print("Target channel not found. Available channels:")
+               for channel in channels.get('items', []):
+                   print(f"Channel Title: {channel['snippet']['title']} (ID: {channel['id']})")
                return None
                
            except Exception as e:
@@ -119,27 +181,41 @@ class YouTubeUploader:
                if attempt < self.max_retries - 1:
                    print(f"Retrying in {self.retry_delay} seconds...")
                    time.sleep(self.retry_delay)
-                   self.authenticate()  # 재인증
+                   self.ensure_authenticated()
                else:
                    print("All attempts to get channel ID failed")
                    raise
 
    def upload_video(self, file_path, title, description, privacy_status="public"):
        """비디오 업로드 (재시도 로직 포함)"""
-       if not self._check_upload_limit():
+       quota_token = self._reserve_upload()
+       if quota_token is None:
            return None
            
+       try:
+           video_id = self._upload_with_retries(file_path, title, description, privacy_status)
+       except Exception:
+           # insert 요청을 보낸 뒤 실패해도 쿼터는 차감됨
+           self.quota.cancel_upload(quota_token, units_spent=True)
+           raise
+           
+       if video_id:
+           self.quota.commit_upload(quota_token, video_id)
+           usage = self.quota.usage()
+           print(f"Daily uploads: {usage['uploads']}/{usage['max_uploads']}")
+       else:
+           self.quota.cancel_upload(quota_token)
+       return video_id
+
+   def _upload_with_retries(self, file_path, title, description, privacy_status):
        for attempt in range(self.max_retries):
            try:
-               if not self.youtube:
-                   print("Authenticating...")
-                   self.authenticate()
+               self.ensure_authenticated()
 
                if not os.path.exists(file_path):
                    print(f"Error: Video file not found at {file_path}")
                    return None
 
-               print("Getting channel ID...")
                channel_id = self.get_channel_id()
                if not channel_id:
                    print("Could not find target channel")
@@ -160,45 +236,82 @@ class YouTubeUploader:
                }
 
                print(f"Starting upload attempt {attempt + 1}/{self.max_retries}")
+               media = MediaFileUpload(
+                   file_path, 
+                   chunksize=self.chunk_size,
+                   resumable=True
+               )
                insert_request = self.youtube.videos().insert(
                    part=','.join(body.keys()),
                    body=body,
-                   media_body=MediaFileUpload(
-                       file_path, 
-                       chunksize=1024*1024,
-                       resumable=True
-                   )
+                   media_body=media
                )
 
+               # 저장된 세션이 있으면 이어서 업로드 (서버에 실제 오프셋을 먼저 확인)
+               session_key = self.session_store.key_for(file_path, title)
+               session = self.session_store.get(session_key)
+               if session:
+                   print(f"Resuming upload session at {session['progress'] / 1024 / 1024:.1f} MB")
+                   insert_request.resumable_uri = session['uri']
+                   insert_request.resumable_progress = session['progress']
+                   insert_request._in_error_state = True
+
                response = None
+               chunk_retries = 0
                while response is None:
                    try:
+                       chunk_start = time.monotonic()
+                       progress_before = insert_request.resumable_progress
                        status, response = insert_request.next_chunk()
+                       chunk_retries = 0
+                       
+                       if response is None and insert_request.resumable_uri:
+                           self.session_store.save(
+                               session_key,
+                               insert_request.resumable_uri,
+                               insert_request.resumable_progress,
+                               file_path
+                           )
+                       self._adapt_chunk_size(
+                           media,
+                           insert_request.resumable_progress - progress_before,
+                           time.monotonic() - chunk_start
+                       )
                        if status:
                            print(f"Uploaded {int(status.progress() * 100)}%")
                    except HttpError as e:
                        if "uploadLimitExceeded" in str(e):
                            print("YouTube upload limit exceeded")
-                           self.daily_upload_count = self.MAX_DAILY_UPLOADS
+                           self.quota.mark_exhausted()
                            return None
-                       elif e.resp.status in [500, 502, 503, 504]:
+                       elif e.resp.status in [404, 410] and insert_request.resumable_uri:
+                           # 세션 만료: 처음부터 새 세션으로 다시 시도
+                           print("Upload session expired on the server")
+                           self.session_store.remove(session_key)
+                           raise
+                       elif e.resp.status in RETRIABLE_STATUS_CODES:
                            # 재시도 가능한 서버 에러
-                           continue
+                           chunk_retries += 1
+                           if chunk_retries > self.max_chunk_retries:
+                               raise
+                           print(f"Server error {e.resp.status} during upload")
+                           self._backoff(chunk_retries)
                        else:
                            raise
-                   except (ConnectionError, ConnectionAbortedError) as e:
-                       print(f"Connection error: {e}")
-                       if attempt < self.max_retries - 1:
-                           print(f"Retrying in {self.retry_delay} seconds...")
-                           time.sleep(self.retry_delay)
-                           break
-                       else:
+                   except RETRIABLE_EXCEPTIONS as e:
+                       # 같은 세션을 유지하고 서버 오프셋부터 이어서 전송
+                       chunk_retries += 1
+                       if chunk_retries > self.max_chunk_retries:
                            raise
+                       print(f"Connection error: {e}")
+                       insert_request._in_error_state = True
+                       media._chunksize = max(MIN_CHUNK_SIZE, media._chunksize // 2 // CHUNK_UNIT * CHUNK_UNIT)
+                       self.chunk_size = media._chunksize
+                       self._backoff(chunk_retries)
 
                if response:
+                   self.session_store.remove(session_key)
                    print(f"Upload Complete! Video ID: {response['id']}")
-                   self.daily_upload_count += 1
-                   print(f"Daily uploads: {self.daily_upload_count}/{self.MAX_DAILY_UPLOADS}")
                    return response['id']
 
            except Exception as e:
@@ -206,7 +319,8 @@ class YouTubeUploader:
                if attempt < self.max_retries - 1:
                    print(f"Retrying in {self.retry_delay} seconds...")
                    time.sleep(self.retry_delay)
-                   self.authenticate()  # 재인증
+                   if isinstance(e, HttpError) and e.resp.status == 401:
+                       self.authenticate()  # 재인증
                else:
                    print("All upload attempts failed")
                    raise
@@ -0,0 +1,119 @@
+# src/video/background.py
+import numpy as np
+import cv2
+
+
+class GeometricBackgroundRenderer:
+    """육각형 패턴 배경을 벡터화해서 렌더링하는 엔진
+
+    그라데이션은 색상 조합별로 한 번만 계산하고, 육각형은 자신의
+    바운딩 박스(ROI) 안에서만 블렌딩해서 하나의 프레임 버퍼를 재사용한다.
+    layout(Layout)이 주어지면 육각형 크기와 선 두께는 해상도에, 회전 속도는
+    fps에 맞춰서 시간 기준으로 같은 모양이 되도록 변환한다.
+    """
+
+    HEX_SIZE = 150
+    ROTATION_SPEED = 0.02
+    FILL_ALPHA = 0.3
+    LINE_THICKNESS = 2
+
+    def __init__(self, width, height, layout=None):
+        self.width = width
+        self.height = height
+        self.hex_size = self.HEX_SIZE
+        self.rotation_speed = self.ROTATION_SPEED
+        self.line_thickness = self.LINE_THICKNESS
+        if layout is not None:
+            self.hex_size = layout.px(self.HEX_SIZE)
+            self.rotation_speed = layout.per_frame(self.ROTATION_SPEED)
+            self.line_thickness = layout.px(self.LINE_THICKNESS)
+
+        # 색상 조합 이름 -> 그라데이션 프레임 (height, width, 3)
+        self._gradients = {}
+
+        # 재사용하는 프레임 버퍼
+        self._frame = np.empty((height, width, 3), dtype=np.uint8)
+
+        # 육각형 하나의 ROI를 담는 작업 버퍼
+        roi_size = 2 * (self.hex_size + self.line_thickness + 2)
+        self._scratch = np.empty((roi_size, roi_size, 3), dtype=np.uint8)
+
+        # 육각형 그리드 (프레임과 무관한 값은 미리 계산)
+        hex_spacing = int(self.hex_size * 1.5)
+        rows = height // hex_spacing + 2
+        cols = width // hex_spacing + 2
+        row_idx, col_idx = np.meshgrid(np.arange(rows), np.arange(cols), indexing="ij")
+
+        centers_x = col_idx * hex_spacing
+        centers_y = row_idx * hex_spacing + (col_idx % 2) * (hex_spacing // 2)
+
+        self._centers_x = centers_x.ravel().astype(np.float64)
+        self._centers_y = centers_y.ravel().astype(np.float64)
+        self._phase = ((row_idx + col_idx) * 0.1).ravel()
+        self._vertex_offsets = np.arange(6) * np.pi / 3
+
+    def _gradient(self, scheme):
+        """색상 조합별 세로 그라데이션 (캐시)"""
+        name = scheme["name"]
+        gradient = self._gradients.get(name)
+        if gradient is None:
+            primary = np.array(scheme["colors"]["primary"], dtype=np.float64)
+            secondary = np.array(scheme["colors"]["secondary"], dtype=np.float64)
+            progress = (np.arange(self.height) / self.height)[:, None]
+            # _interpolate_color와 동일하게 int()로 버림
+            gradient = (primary + (secondary - primary) * progress).astype(np.uint8)
+            gradient = np.ascontiguousarray(
+                np.broadcast_to(gradient[:, None, :], (self.height, self.width, 3))
+            )
+            self._gradients[name] = gradient
+        return gradient
+
+    def _hexagons(self, scheme, frame_number):
+        """모든 육각형의 꼭짓점과 색상을 한 번에 계산"""
+        angles = frame_number * self.rotation_speed + self._phase
+        theta = angles[:, None] + self._vertex_offsets[None, :]
+
+        # int()와 같은 0 방향 버림
+        px = (self._centers_x[:, None] + self.hex_size * np.cos(theta)).astype(np.int32)
+        py = (self._centers_y[:, None] + self.hex_size * np.sin(theta)).astype(np.int32)
+        points = np.stack([px, py], axis=-1)
+
+        primary = np.array(scheme["colors"]["primary"], dtype=np.float64)
+        accent = np.array(scheme["colors"]["accent"], dtype=np.float64)
+        factor = (np.sin(angles) * 0.5 + 0.5)[:, None]
+        colors = (primary + (accent - primary) * factor).astype(np.int64)
+
+        return points, colors
+
+    def render(self, scheme, frame_number):
+        """프레임 렌더링
+
+        반환값은 내부 버퍼이므로 다음 호출 시 덮어써진다.
+        보관이 필요하면 호출하는 쪽에서 복사해야 한다.
+        """
+        bg = self._frame
+        np.copyto(bg, self._gradient(scheme))
+
+        points, colors = self._hexagons(scheme, frame_number)
+        margin = self.line_thickness + 1
+
+        for hex_points, color in zip(points, colors):
+            color = tuple(int(c) for c in color)
+
+            # 바운딩 박스(ROI)만 블렌딩
+            x0 = max(int(hex_points[:, 0].min()) - margin, 0)
+            y0 = max(int(hex_points[:, 1].min()) - margin, 0)
+            x1 = min(int(hex_points[:, 0].max()) + margin + 1, self.width)
+            y1 = min(int(hex_points[:, 1].max()) + margin + 1, self.height)
+
+            if x0 < x1 and y0 < y1:
+                roi = bg[y0:y1, x0:x1]
+                overlay = self._scratch[:y1 - y0, :x1 - x0]
+                np.copyto(overlay, roi)
+                cv2.fillPoly(overlay, [hex_points - (x0, y0)], color)
+                cv2.addWeighted(overlay, self.FILL_ALPHA, roi, 1 - self.FILL_ALPHA, 0, roi)
+
+            cv2.polylines(bg, [hex_points.reshape(-1, 1, 2)], True, color,
+                          self.line_thickness, cv2.LINE_AA)
+
+        return bg
@@ -0,0 +1,185 @@
+# src/video/compositor.py
+from bisect import bisect_right
+import numpy as np
+
+
+class StaticLayerCompositor:
+    """정적 레이어 사전 합성기
+
+    시간 구간마다 변하지 않는 레이어(질문 카드, 버튼 등)를 RGBA 오버레이
+    하나로 미리 합쳐 두고, 각 프레임은 배경 + 오버레이 한 번의 블렌딩으로 만든다.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.layers = []
+
+        self._starts = []
+        self._overlays = []
+        self._frame = np.empty((height, width, 3), dtype=np.uint8)
+
+    def add_layer(self, image, position, start=0, duration=None, mask=None):
+        """레이어 추가
+
+        position은 (x, y)이며 x, y에 'center'를 쓸 수 있다.
+        mask는 선택 사항으로 0~1 범위의 (h, w) 알파 값이다.
+        """
+        h, w = image.shape[:2]
+        x, y = position
+        if x == 'center':
+            x = (self.width - w) // 2
+        if y == 'center':
+            y = (self.height - h) // 2
+
+        end = None if duration is None else start + duration
+        self.layers.append({
+            "image": image,
+            "mask": mask,
+            "x": int(x),
+            "y": int(y),
+            "start": start,
+            "end": end,
+        })
+
+    def build(self, duration):
+        """구간별 오버레이 생성 (같은 레이어 조합은 재사용)"""
+        times = {0}
+        for layer in self.layers:
+            if 0 < layer["start"] < duration:
+                times.add(layer["start"])
+            if layer["end"] is not None and 0 < layer["end"] < duration:
+                times.add(layer["end"])
+
+        self._starts = []
+        self._overlays = []
+        rendered = {}
+        previous = None
+
+        for t in sorted(times):
+            active = tuple(
+                i for i, layer in enumerate(self.layers)
+                if layer["start"] <= t and (layer["end"] is None or t < layer["end"])
+            )
+            if active == previous:
+                continue
+            previous = active
+
+            if active not in rendered:
+                rendered[active] = self._flatten(active)
+            self._starts.append(t)
+            self._overlays.append(rendered[active])
+
+        print(f"Pre-composited {len(self.layers)} layers into "
+              f"{len(rendered)} overlays over {len(self._starts)} intervals")
+        return self
+
+    def _flatten(self, layer_indices):
+        """활성 레이어들을 하나의 RGBA 오버레이로 합성"""
+        boxes = []
+        for i in layer_indices:
+            layer = self.layers[i]
+            h, w = layer["image"].shape[:2]
+            x0, y0 = max(layer["x"], 0), max(layer["y"], 0)
+            x1 = min(layer["x"] + w, self.width)
+            y1 = min(layer["y"] + h, self.height)
+            if x0 < x1 and y0 < y1:
+                boxes.append((i, x0, y0, x1, y1))
+
+        if not boxes:
+            return None
+
+        # 모든 레이어를 포함하는 영역만 저장
+        ox0 = min(box[1] for box in boxes)
+        oy0 = min(box[2] for box in boxes)
+        ox1 = max(box[3] for box in boxes)
+        oy1 = max(box[4] for box in boxes)
+
+        rgb = np.zeros((oy1 - oy0, ox1 - ox0, 3), dtype=np.float32)
+        alpha = np.zeros((oy1 - oy0, ox1 - ox0), dtype=np.float32)
+
+        for i, x0, y0, x1, y1 in boxes:
+            layer = self.layers[i]
+            sx, sy = x0 - layer["x"], y0 - layer["y"]
+            src = layer["image"][sy:sy + (y1 - y0), sx:sx + (x1 - x0), :3]
+
+            if layer["mask"] is None:
+                src_alpha = np.ones(src.shape[:2], dtype=np.float32)
+            else:
+                src_alpha = layer["mask"][sy:sy + (y1 - y0), sx:sx + (x1 - x0)].astype(np.float32)
+
+            # 위에 올라오는 레이어 순서대로 over 합성 (premultiplied)
+            dst_rgb = rgb[y0 - oy0:y1 - oy0, x0 - ox0:x1 - ox0]
+            dst_alpha = alpha[y0 - oy0:y1 - oy0, x0 - ox0:x1 - ox0]
+            dst_rgb *= (1 - src_alpha)[..., None]
+            dst_rgb += src.astype(np.float32) * src_alpha[..., None]
+            dst_alpha *= (1 - src_alpha)
+            dst_alpha += src_alpha
+
+        if ((alpha == 0) | (alpha == 1)).all():
+            # 불투명 레이어만 있으면 블렌딩 대신 사각형 단위로 복사
+            return {
+                "x": ox0,
+                "y": oy0,
+                "rgb": np.round(rgb).astype(np.uint8),
+                "rects": self._covered_rects(alpha > 0),
+                "alpha": None,
+            }
+
+        return {
+            "x": ox0,
+            "y": oy0,
+            "rgb": rgb,
+            "rects": None,
+            "alpha": alpha[..., None],
+        }
+
+    @staticmethod
+    def _covered_rects(covered):
+        """덮인 영역을 서로 겹치지 않는 사각형 목록으로 분할"""
+        rects = []
+        height = covered.shape[0]
+        # 덮인 모양이 같은 연속된 행끼리 묶음
+        changes = np.flatnonzero((covered[1:] != covered[:-1]).any(axis=1)) + 1
+        bounds = [0] + changes.tolist() + [height]
+
+        for y0, y1 in zip(bounds[:-1], bounds[1:]):
+            row = np.concatenate(([0], covered[y0].astype(np.int8), [0]))
+            edges = np.flatnonzero(np.diff(row))
+            for x0, x1 in zip(edges[::2], edges[1::2]):
+                rects.append((y0, y1, int(x0), int(x1)))
+
+        return rects
+
+    def overlay_at(self, t):
+        index = bisect_right(self._starts, t) - 1
+        if index < 0:
+            return None
+        return self._overlays[index]
+
+    def compose(self, background, t):
+        """배경 프레임 위에 t 시점의 오버레이를 합성
+
+        반환값은 내부 버퍼이므로 다음 호출 시 덮어써진다.
+        """
+        frame = self._frame
+        np.copyto(frame, background)
+
+        overlay = self.overlay_at(t)
+        if overlay is None:
+            return frame
+
+        ox, oy = overlay["x"], overlay["y"]
+        rgb = overlay["rgb"]
+
+        if overlay["alpha"] is None:
+            for y0, y1, x0, x1 in overlay["rects"]:
+                frame[oy + y0:oy + y1, ox + x0:ox + x1] = rgb[y0:y1, x0:x1]
+        else:
+            h, w = rgb.shape[:2]
+            roi = frame[oy:oy + h, ox:ox + w]
+            # premultiplied 알파 블렌딩
+            blended = roi * (1 - overlay["alpha"]) + rgb
+            np.copyto(roi, np.clip(blended, 0, 255), casting='unsafe')
+
+        return frame
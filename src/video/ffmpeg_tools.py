@@ -0,0 +1,76 @@
+# src/video/ffmpeg_tools.py
+import os
+import subprocess
+from moviepy.config import get_setting
+
+
+def run_ffmpeg(args):
+    """moviepy에 설정된 ffmpeg 바이너리로 명령 실행"""
+    cmd = [get_setting("FFMPEG_BINARY"), "-y", "-loglevel", "error"] + list(args)
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"ffmpeg failed ({result.returncode}): {result.stderr.decode(errors='replace')}"
+        )
+
+
+def mux_audio(video_path, audio_path, output_path, audio_codec="copy", output_args=()):
+    """이미 인코딩된 비디오에 오디오를 붙임 (비디오 스트림은 재인코딩하지 않음)
+
+    output_args: 컨테이너 옵션 (예: -movflags +faststart)
+    """
+    run_ffmpeg([
+        "-i", video_path,
+        "-i", audio_path,
+        "-map", "0:v:0",
+        "-map", "1:a:0",
+        "-c:v", "copy",
+        "-c:a", audio_codec,
+        "-shortest",
+        *output_args,
+        output_path,
+    ])
+    return output_path
+
+
+def concat_segments(segment_paths, output_path, output_args=()):
+    """같은 코덱 설정으로 인코딩된 세그먼트들을 재인코딩 없이 이어붙임 (concat demuxer)"""
+    list_path = f"{output_path}.segments.txt"
+    with open(list_path, "w", encoding="utf-8") as f:
+        for path in segment_paths:
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+
+    try:
+        run_ffmpeg([
+            "-f", "concat",
+            "-safe", "0",
+            "-i", list_path,
+            "-c", "copy",
+            *output_args,
+            output_path,
+        ])
+    finally:
+        os.remove(list_path)
+    return output_path
+
+
+def decode_pcm(path, sample_rate=44100, channels=2):
+    """오디오 파일을 int16 PCM 바이트(s16le, 인터리브)로 디코딩"""
+    cmd = [
+        get_setting("FFMPEG_BINARY"), "-loglevel", "error",
+        "-i", path,
+        "-vn",
+        "-f", "s16le",
+        "-acodec", "pcm_s16le",
+        "-ar", str(sample_rate),
+        "-ac", str(channels),
+        "-",
+    ]
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"ffmpeg failed to decode {path} ({result.returncode}): "
+            f"{result.stderr.decode(errors='replace')}"
+        )
+    return result.stdout
@@ -0,0 +1,201 @@
+# src/video/frame_cache.py
+import os
+import numpy as np
+
+
+class BackgroundFrameCache:
+    """배경 프레임 캐시
+
+    배경 애니메이션은 (색상 조합, 프레임 번호, 해상도, fps)에만 의존하고
+    인트로/퀴즈 섹션/아웃트로가 모두 t=0부터 다시 시작하므로
+    이미 렌더링한 프레임을 재사용한다.
+
+    - 메모리: 프레임 0..N-1을 고정 보관 (모든 구간이 처음부터 순서대로
+      읽으므로 LRU는 적중하지 않는다). 현재 색상 조합/해상도/fps의 프레임만 보관한다.
+      N은 max_frames와 (max_bytes / workers)에 들어가는 프레임 수 중 작은 값이다.
+      workers는 같은 설정으로 동시에 렌더링하는 생성기 수 (프로세스/스레드)이다.
+    - 디스크(선택): 색상 조합/해상도/fps별 memory-mapped .npy 파일에 저장해서
+      다음 섹션이나 다음 실행에서도 재사용. 전체 크기는 max_disk_bytes 이하로
+      유지하고, 넘으면 오래 쓰지 않은 색상 조합의 파일부터 지운다.
+    - 두 캐시 모두 해당하지 않는 프레임은 복사하지 않고 렌더러의 버퍼를 그대로 반환
+    """
+
+    def __init__(self, max_frames=16, cache_dir=None, spill_frames=450,
+                 max_bytes=128 << 20, max_disk_bytes=2 << 30, workers=1):
+        self.max_frames = max_frames
+        self.cache_dir = cache_dir
+        self.spill_frames = spill_frames
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.workers = workers
+
+        # frame_number -> 고정 보관 프레임 (_pinned_group의 프레임만)
+        self._frames = {}
+        self._pinned_group = None
+        self._pinned_limit = 0
+        # (scheme_name, resolution, fps) -> (frames memmap, filled memmap)
+        self._spills = {}
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get(self, scheme_name, frame_number, resolution, render_fn, fps=30):
+        """캐시된 프레임 반환, 없으면 render_fn(frame_number)로 렌더링
+
+        회전 속도가 fps에 따라 다르므로 같은 프레임 번호라도 fps별로 따로 저장한다.
+        반환된 프레임은 읽기 전용으로 취급해야 하고, 캐시되지 않은 프레임은
+        렌더러의 재사용 버퍼이므로 다음 호출 전까지만 유효하다.
+        """
+        group = (scheme_name, resolution, fps)
+        if group != self._pinned_group:
+            # 색상 조합/해상도가 바뀌면 이전 프레임은 더 이상 쓰이지 않음
+            self._frames.clear()
+            self._pinned_group = group
+            self._pinned_limit = min(
+                self.max_frames,
+                self.max_bytes // max(1, self.workers) // self._frame_bytes(resolution)
+            )
+
+        frame = self._frames.get(frame_number)
+        if frame is not None:
+            self.hits += 1
+            return frame
+
+        spill = self._get_spill(scheme_name, resolution, fps)
+        spilled = spill is not None and frame_number < len(spill[1])
+        if spilled:
+            frames, filled = spill
+            if filled[frame_number]:
+                self.disk_hits += 1
+                return frames[frame_number]
+
+        self.misses += 1
+        pinned = frame_number < self._pinned_limit
+        if not pinned and not spilled:
+            return render_fn(frame_number)
+
+        frame = render_fn(frame_number).copy()
+
+        if spilled:
+            frames, filled = spill
+            frames[frame_number] = frame
+            # 프레임 데이터를 쓴 뒤에 완료 표시
+            filled[frame_number] = True
+
+        if pinned:
+            self._frames[frame_number] = frame
+
+        return frame
+
+    @staticmethod
+    def _frame_bytes(resolution):
+        width, height = resolution[:2]
+        return width * height * 3
+
+    def prepare(self, scheme_name, resolution, fps=30):
+        """디스크 캐시 파일을 미리 생성 (병렬 워커 시작 전에 호출)"""
+        self._get_spill(scheme_name, resolution, fps)
+
+    def _get_spill(self, scheme_name, resolution, fps=30):
+        """색상 조합/해상도/fps별 디스크 캐시 파일 열기"""
+        if not self.cache_dir:
+            return None
+
+        spill_key = (scheme_name, resolution, fps)
+        if spill_key in self._spills:
+            return self._spills[spill_key]
+
+        # 다른 색상 조합의 파일은 닫아서 정리 대상이 되게 함 (한 번에 한 조합만 렌더링)
+        self.flush()
+        self._spills.clear()
+
+        width, height = resolution[:2]
+        base = os.path.join(self.cache_dir, f"{scheme_name}_{width}x{height}_{fps}fps")
+        frames_path = f"{base}.npy"
+        filled_path = f"{base}.filled.npy"
+        # 파일 하나가 디스크 예산을 넘지 않도록 프레임 수 제한
+        spill_frames = min(self.spill_frames, self.max_disk_bytes // self._frame_bytes(resolution))
+        if spill_frames <= 0:
+            self._spills[spill_key] = None
+            return None
+        shape = (spill_frames, height, width, 3)
+
+        try:
+            frames = filled = None
+            if os.path.exists(frames_path) and os.path.exists(filled_path):
+                frames = np.load(frames_path, mmap_mode="r+")
+                filled = np.load(filled_path, mmap_mode="r+")
+                if frames.shape != shape or filled.shape != (spill_frames,):
+                    # 설정이 바뀐 캐시는 새로 만든다
+                    print(f"Background frame cache shape changed, recreating: {frames_path}")
+                    del frames, filled
+                    frames = filled = None
+
+            if frames is None:
+                self._evict_spills(keep=base, needed=int(np.prod(shape)))
+                frames = np.lib.format.open_memmap(
+                    frames_path, mode="w+", dtype=np.uint8, shape=shape
+                )
+                filled = np.lib.format.open_memmap(
+                    filled_path, mode="w+", dtype=np.bool_, shape=(spill_frames,)
+                )
+            else:
+                # 최근에 쓴 조합이 정리 대상에서 늦게 빠지도록 수정 시각 갱신
+                os.utime(frames_path)
+            print(f"Background frame cache: {frames_path} ({int(filled.sum())} frames cached)")
+        except Exception as e:
+            print(f"Error opening background frame cache: {e}")
+            frames = filled = None
+
+        spill = (frames, filled) if frames is not None else None
+        self._spills[spill_key] = spill
+        return spill
+
+    def _evict_spills(self, keep, needed):
+        """새 파일(needed 바이트)을 만들어도 max_disk_bytes를 넘지 않도록
+        오래 쓰지 않은 색상 조합의 캐시 파일부터 삭제"""
+        groups = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".npy") or name.endswith(".filled.npy"):
+                continue
+            base = os.path.join(self.cache_dir, name[:-len(".npy")])
+            if base == keep:
+                continue
+            try:
+                stat = os.stat(f"{base}.npy")
+            except OSError:
+                continue
+            groups.append((stat.st_mtime, stat.st_size, base))
+
+        total = sum(size for _, size, _ in groups)
+        for _, size, base in sorted(groups):
+            if total + needed <= self.max_disk_bytes:
+                break
+            print(f"Evicting background frame cache: {base}.npy")
+            for path in (f"{base}.npy", f"{base}.filled.npy"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+
+    def flush(self):
+        """디스크 캐시 동기화"""
+        for spill in self._spills.values():
+            if spill is not None:
+                frames, filled = spill
+                frames.flush()
+                filled.flush()
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "cached_frames": len(self._frames),
+            "pinned_limit": self._pinned_limit,
+        }
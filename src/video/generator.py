@@ -7,10 +7,21 @@ import random
 import cv2
 import traceback
 import textwrap
-import requests
 from datetime import datetime
 import shutil
-from googleapiclient.discovery import build  # Google API 관련 import 추가
+from src.video.background import GeometricBackgroundRenderer
+from src.video.frame_cache import BackgroundFrameCache
+from src.video.ffmpeg_tools import mux_audio, concat_segments
+from src.video.parallel import render_segments_parallel
+from src.video.raw_writer import RawFrameWriter
+from src.video.image_fetcher import ImageFetcher
+from src.audio.tts_service import TTSService
+from src.audio.asset_cache import default_audio_cache
+from src.video.compositor import StaticLayerCompositor
+from src.video.sprite_cache import default_sprite_cache, image_digest
+from src.video.timeline import TimelinePlanner, VideoTimeline
+from src.video.render_profiles import get_render_profile
+from src.video.layout import Layout
 
 # ImageMagick 경로 설정
 IMAGEMAGICK_BINARY = os.getenv('IMAGEMAGICK_BINARY', r'C:\Program Files\ImageMagick-7.1.1-Q16-HDRI\magick.exe')
@@ -19,13 +30,19 @@ change_settings({"IMAGEMAGICK_BINARY": IMAGEMAGICK_BINARY})
 # src/video/generator.py 수정
 
 class QuizUIElements:
-    def __init__(self, width, height):
+    def __init__(self, width, height, sprite_cache=None, scheme_name=None, image_fetcher=None,
+                 layout=None):
         self.width = width
         self.height = height
         
-        # Google API 키 설정
-        self.GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
-        self.GOOGLE_SEARCH_ENGINE_ID = os.getenv('GOOGLE_SEARCH_ENGINE_ID')
+        # 기준 해상도(1080x1920)의 픽셀 값을 현재 해상도로 변환
+        self.layout = layout or Layout(width, height)
+        
+        # 이미지 수집 (세션/검색 클라이언트 재사용, 디스크 캐시)
+        self.image_fetcher = image_fetcher or ImageFetcher.from_env()
+        
+        # 스프라이트 캐시 (지정하지 않으면 프로세스 전체에서 공유)
+        self.sprite_cache = sprite_cache or default_sprite_cache
         
         # 다양한 색상 조합 정의
         self.color_schemes = [
@@ -331,10 +348,16 @@ class QuizUIElements:
             }
         ]
         
-        # 랜덤하게 색상 선택
+        # 랜덤하게 색상 선택 (병렬 렌더링 워커는 지정된 색상 사용)
         self.current_scheme = random.choice(self.color_schemes)
+        for scheme in self.color_schemes:
+            if scheme["name"] == scheme_name:
+                self.current_scheme = scheme
         print(f"Selected color scheme: {self.current_scheme['name']}")
 
+        # 배경 렌더러 (그라데이션 캐시 및 프레임 버퍼 재사용)
+        self.background_renderer = GeometricBackgroundRenderer(width, height, layout=self.layout)
+
 
     def _interpolate_color(self, color1, color2, factor):
         """두 색상 사이의 중간 색상 계산"""
@@ -344,81 +367,23 @@ class QuizUIElements:
         )
 
     def create_geometric_background(self, frame_number):
-        """현대적인 기하학적 패턴 배경"""
-        bg = np.zeros((self.height, self.width, 3), dtype=np.uint8)
-        
-        # 기본 그라데이션
-        for y in range(self.height):
-            progress = y / self.height
-            color = self._interpolate_color(
-                self.current_scheme["colors"]["primary"],
-                self.current_scheme["colors"]["secondary"],
-                progress
-            )
-            bg[y, :] = color
-        
-        # 동적 육각형 패턴
-        hex_size = 150
-        hex_spacing = int(hex_size * 1.5)
-        rows = self.height // hex_spacing + 2
-        cols = self.width // hex_spacing + 2
-        
-        for row in range(rows):
-            for col in range(cols):
-                x = col * hex_spacing
-                y = row * hex_spacing
-                if col % 2:
-                    y += hex_spacing // 2
-                    
-                # 육각형 회전 애니메이션
-                angle = frame_number * 0.02 + (row + col) * 0.1
-                points = []
-                for i in range(6):
-                    theta = angle + i * np.pi / 3
-                    px = x + hex_size * np.cos(theta)
-                    py = y + hex_size * np.sin(theta)
-                    points.append([[int(px), int(py)]])
-                
-                points = np.array(points, dtype=np.int32)
-                color = self._interpolate_color(
-                    self.current_scheme["colors"]["primary"],
-                    self.current_scheme["colors"]["accent"],
-                    np.sin(angle) * 0.5 + 0.5
-                )
-                
-                # 육각형 그리기
-                overlay = bg.copy()
-                cv2.fillPoly(overlay, [points], color)
-                cv2.addWeighted(overlay, 0.3, bg, 0.7, 0, bg)
-                cv2.polylines(bg, [points], True, color, 2, cv2.LINE_AA)
-        
-        return bg
+        """현대적인 기하학적 패턴 배경
+
+        반환되는 프레임은 렌더러의 재사용 버퍼이므로 다음 호출 시 덮어써진다.
+        """
+        return self.background_renderer.render(self.current_scheme, frame_number)
 
     def get_image_for_quiz(self, keywords):
         """이미지 검색 및 대체 이미지 생성"""
         try:
-            service = build("customsearch", "v1", developerKey=self.GOOGLE_API_KEY)
-            
-            enhanced_query = f"{keywords} high quality photo"
-            result = service.cse().list(
-                q=enhanced_query,
-                cx=self.GOOGLE_SEARCH_ENGINE_ID,
-                searchType='image',
-                num=1,
-                imgType='photo',
-                safe='active'
-            ).execute()
+            image_data = self.image_fetcher.fetch(keywords)
             
-            if 'items' in result:
-                image_url = result['items'][0]['link']
-                print(f"Found image for keywords: {keywords}")
-                
-                image_data = requests.get(image_url).content
-                image_array = np.asarray(bytearray(image_data), dtype=np.uint8)
+            if image_data:
+                image_array = np.frombuffer(image_data, dtype=np.uint8)
                 image = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
                 
                 if image is not None:
-                    return cv2.resize(image, (800, 400))
+                    return cv2.resize(image, (self.layout.px(800), self.layout.px(400)))
                     
             print(f"Creating visual placeholder for: {keywords}")
             return self._create_fallback_image(keywords)
@@ -427,8 +392,21 @@ class QuizUIElements:
             print(f"Error in get_image_for_quiz: {e}")
             return self._create_fallback_image(keywords)
 
-    def _create_fallback_image(self, query, width=800, height=400):
-        """시각적으로 더 매력적인 대체 이미지 생성"""
+    def prefetch_images(self, keywords_list):
+        """렌더링 전에 모든 질문의 이미지를 동시에 가져오기 시작"""
+        return self.image_fetcher.prefetch(keywords_list)
+
+    def _create_fallback_image(self, query, width=None, height=None):
+        """시각적으로 더 매력적인 대체 이미지 생성 (캐시)"""
+        width = width or self.layout.px(800)
+        height = height or self.layout.px(400)
+        key = ("fallback", self.current_scheme["name"], query, width, height, self.layout.key)
+        return self.sprite_cache.get_or_create(
+            key, lambda: self._render_fallback_image(query, width, height)
+        )
+
+    def _render_fallback_image(self, query, width, height):
+        px = self.layout.px
         image = np.zeros((height, width, 3), dtype=np.uint8)
         
         # 그라데이션 배경 생성
@@ -444,9 +422,9 @@ class QuizUIElements:
         # 장식적 요소 추가
         # 1. 반투명 오버레이 패턴
         pattern = np.zeros((height, width, 3), dtype=np.uint8)
-        for i in range(0, width, 50):
-            for j in range(0, height, 50):
-                cv2.circle(pattern, (i, j), 20, self.current_scheme["colors"]["accent"], 1)
+        for i in range(0, width, px(50)):
+            for j in range(0, height, px(50)):
+                cv2.circle(pattern, (i, j), px(20), self.current_scheme["colors"]["accent"], 1)
         image = cv2.addWeighted(image, 0.9, pattern, 0.1, 0)
         
         # 2. 중앙에 큰 아이콘 또는 심볼
@@ -458,12 +436,12 @@ class QuizUIElements:
         keywords = query.lower()
         if any(word in keywords for word in ['food', 'dish', 'cuisine', 'meal']):
             # 음식 관련 - 접시 모양
-            cv2.circle(image, (center_x, center_y), icon_size, (255, 255, 255), 2)
-            cv2.circle(image, (center_x, center_y), icon_size-10, (255, 255, 255), 1)
+            cv2.circle(image, (center_x, center_y), icon_size, (255, 255, 255), px(2))
+            cv2.circle(image, (center_x, center_y), icon_size-px(10), (255, 255, 255), 1)
         elif any(word in keywords for word in ['sport', 'game', 'play']):
             # 스포츠 관련 - 공 모양
             cv2.circle(image, (center_x, center_y), icon_size, (255, 255, 255), -1)
-            cv2.circle(image, (center_x, center_y), icon_size, (200, 200, 200), 2)
+            cv2.circle(image, (center_x, center_y), icon_size, (200, 200, 200), px(2))
         elif any(word in keywords for word in ['science', 'tech', 'technology']):
             # 과학/기술 관련 - 육각형 패턴
             for i in range(3):
@@ -471,15 +449,15 @@ class QuizUIElements:
                     [center_x + int(icon_size * np.cos(angle + i * np.pi/3)) for angle in np.linspace(0, 2*np.pi, 7)],
                     [center_y + int(icon_size * np.sin(angle + i * np.pi/3)) for angle in np.linspace(0, 2*np.pi, 7)]
                 ], np.int32).T
-                cv2.polylines(image, [pts], True, (255, 255, 255), 2)
+                cv2.polylines(image, [pts], True, (255, 255, 255), px(2))
         else:
             # 기본 장식 - 동심원
-            for r in range(0, icon_size, 20):
+            for r in range(0, icon_size, px(20)):
                 cv2.circle(image, (center_x, center_y), r, (255, 255, 255), 1)
         
         # 3. 테두리 추가
-        cv2.rectangle(image, (10, 10), (width-10, height-10), 
-                    self.current_scheme["colors"]["accent"], 2)
+        cv2.rectangle(image, (px(10), px(10)), (width-px(10), height-px(10)), 
+                    self.current_scheme["colors"]["accent"], px(2))
         
         # 4. 부드러운 효과를 위한 블러
         image = cv2.GaussianBlur(image, (5, 5), 0)
@@ -487,13 +465,24 @@ class QuizUIElements:
         return image
 
     def create_modern_question_card(self, question_text, number, image=None, scale_factor=1.0):
-        padding = int(30 * scale_factor)
-        width = 800
+        """질문 카드 생성 (캐시)"""
+        key = ("card", self.current_scheme["name"], question_text, number,
+               image_digest(image), scale_factor, self.layout.key)
+        return self.sprite_cache.get_or_create(
+            key,
+            lambda: self._render_question_card(question_text, number, image, scale_factor)
+        )
+
+    def _render_question_card(self, question_text, number, image, scale_factor):
+        px = self.layout.px
+        padding = px(30 * scale_factor)
+        width = px(800)
         font = cv2.FONT_HERSHEY_DUPLEX
-        font_scale = 1.6
+        font_scale = self.layout.font(1.6)
+        thickness = px(2)
         
         # 이미지 영역
-        img_height = 350
+        img_height = px(350)
         img_width = width - (padding * 2)
         
         if image is not None:
@@ -502,8 +491,8 @@ class QuizUIElements:
             resized_image = self._create_fallback_image(img_width, img_height)
         
         # 텍스트 영역 설정
-        line_height = int(45 * scale_factor)
-        text_start_x = int(150 * scale_factor)
+        line_height = px(45 * scale_factor)
+        text_start_x = px(150 * scale_factor)
         max_text_width = width - text_start_x - padding
         
         # 텍스트 줄바꿈 처리
@@ -513,7 +502,7 @@ class QuizUIElements:
         
         for word in words:
             test_line = ' '.join(current_line + [word])
-            size = cv2.getTextSize(test_line, font, font_scale, 2)[0]
+            size = cv2.getTextSize(test_line, font, font_scale, thickness)[0]
             if size[0] > max_text_width and current_line:
                 lines.append(' '.join(current_line))
                 current_line = [word]
@@ -538,19 +527,19 @@ class QuizUIElements:
         
         # 번호 배지
         circle_y = img_height + padding + text_height//3
-        circle_x = int(70 * scale_factor)
+        circle_x = px(70 * scale_factor)
         cv2.circle(card, 
                 (circle_x, circle_y), 
-                45,
+                px(45),
                 self.current_scheme["colors"]["primary"], 
                 -1, 
                 cv2.LINE_AA)
         
         cv2.putText(card, str(number),
-                (circle_x-20, circle_y+15),
-                font, 2.0,
+                (circle_x-px(20), circle_y+px(15)),
+                font, self.layout.font(2.0),
                 self.current_scheme["colors"]["text_light"], 
-                2, 
+                thickness, 
                 cv2.LINE_AA)
         
         # 질문 텍스트
@@ -561,17 +550,28 @@ class QuizUIElements:
                     (text_start_x, text_y),
                     font, font_scale,
                     self.current_scheme["colors"]["text_dark"], 
-                    2, 
+                    thickness, 
                     cv2.LINE_AA)
         
         return card
 
     def create_modern_button(self, letter, text, selected=False, scale_factor=1.0, dimmed=False):
-        width = int(800 * scale_factor)
-        height = int(80 * scale_factor)
-        padding = int(25 * scale_factor)
-        right_padding = 10
-        margin = int(30 * scale_factor)
+        """답안 버튼 생성 (캐시)"""
+        key = ("button", self.current_scheme["name"], letter, text,
+               selected, scale_factor, dimmed, self.layout.key)
+        return self.sprite_cache.get_or_create(
+            key,
+            lambda: self._render_modern_button(letter, text, selected, scale_factor, dimmed)
+        )
+
+    def _render_modern_button(self, letter, text, selected, scale_factor, dimmed):
+        px = self.layout.px
+        width = px(800 * scale_factor)
+        height = px(80 * scale_factor)
+        padding = px(25 * scale_factor)
+        right_padding = px(10)
+        margin = px(30 * scale_factor)
+        thickness = px(2)
         
         # 버튼 생성
         total_height = height + (margin * 2)
@@ -595,8 +595,8 @@ class QuizUIElements:
                     color, -1, cv2.LINE_AA)
         
         # 레터 원형
-        circle_radius = int(30 * scale_factor)
-        circle_center = (padding + circle_radius + 10, margin + height//2)
+        circle_radius = px(30 * scale_factor)
+        circle_center = (padding + circle_radius + px(10), margin + height//2)
         circle_color = (255, 255, 255) if selected else self.current_scheme["colors"]["primary"]
         
         if dimmed:
@@ -608,7 +608,7 @@ class QuizUIElements:
         # 폰트 설정
         font = cv2.FONT_HERSHEY_DUPLEX
         base_font_scale = 1.4
-        font_scale = base_font_scale * scale_factor
+        font_scale = self.layout.font(base_font_scale * scale_factor)
         
         # 레터 텍스트 색상
         if dimmed:
@@ -617,22 +617,22 @@ class QuizUIElements:
             letter_color = self.current_scheme["colors"]["primary"] if selected else (255, 255, 255)
         
         # 레터 텍스트 그리기
-        letter_x = circle_center[0] - int(15 * scale_factor)
-        letter_y = circle_center[1] + int(12 * scale_factor)
+        letter_x = circle_center[0] - px(15 * scale_factor)
+        letter_y = circle_center[1] + px(12 * scale_factor)
         cv2.putText(button, letter,
                 (letter_x, letter_y),
                 font, font_scale,
-                letter_color, 2, cv2.LINE_AA)
+                letter_color, thickness, cv2.LINE_AA)
         
         # 답안 텍스트 공간 계산
-        text_x = padding + circle_radius * 2 + 30
-        available_width = width - text_x - right_padding - 10
+        text_x = padding + circle_radius * 2 + px(30)
+        available_width = width - text_x - right_padding - px(10)
         
         # 텍스트 크기 계산 및 조정
-        text_size = cv2.getTextSize(text, font, font_scale, 2)[0]
+        text_size = cv2.getTextSize(text, font, font_scale, thickness)[0]
         if text_size[0] > available_width:
             font_scale *= (available_width / float(text_size[0]))
-            text_size = cv2.getTextSize(text, font, font_scale, 2)[0]
+            text_size = cv2.getTextSize(text, font, font_scale, thickness)[0]
         
         # 답안 텍스트 색상 설정
         if dimmed:
@@ -647,76 +647,143 @@ class QuizUIElements:
         cv2.putText(button, text,
                 (text_x, text_y),
                 font, font_scale,
-                text_color, 2, cv2.LINE_AA)
+                text_color, thickness, cv2.LINE_AA)
         
         return button
             
 class QuizVideoGenerator:
-    def __init__(self, output_path="output"):
+    def __init__(self, output_path="output", scheme_name=None, parallel_workers=None,
+                 backend=None, render_profile=None):
         self.output_path = output_path
-        self.width = 1080
-        self.height = 1920
-        self.fps = 30
+        
+        # 인코더 프로필 (draft, publish, publish_720p, archive)
+        # 지정하지 않으면 RENDER_PROFILE 환경 변수 (업로드 경로는 항상 publish를 지정함)
+        self.render_profile = get_render_profile(render_profile)
+        
+        # 프로필의 해상도/fps로 직접 렌더링 (모든 픽셀 값은 layout으로 변환)
+        self.width, self.height = self.render_profile.output_size()
+        self.fps = self.render_profile.fps or Layout.BASE_FPS
+        self.layout = Layout(self.width, self.height, self.fps)
         
         self.title_font = "Arial-Bold"
         self.text_font = "Arial"
         
         # UI 요소 초기화
-        self.ui = QuizUIElements(self.width, self.height)
+        self.ui = QuizUIElements(self.width, self.height, scheme_name=scheme_name, layout=self.layout)
+        
+        # 섹션 병렬 렌더링 워커 수 (0 또는 1이면 순차 렌더링)
+        if parallel_workers is None:
+            parallel_workers = int(os.getenv('RENDER_WORKERS', '0'))
+        self.parallel_workers = parallel_workers
+        # 동시에 인코딩하는 프로세스 수 (인코더 스레드를 CPU 수에서 나눠 씀)
+        self.encoder_workers = max(1, parallel_workers)
+        
+        # TTS 서비스 (TTS_BACKEND: gtts, google-cloud, stub)
+        self.tts = TTSService.from_env()
+        
+        # 디코딩한 배경음악/TTS PCM 캐시 (AUDIO_CACHE_DIR)
+        self.audio_assets = default_audio_cache()
+        
+        # 나레이션 길이로 섹션 길이와 이벤트 시각을 정하는 계획기 (비디오/오디오 공용)
+        self.timeline_planner = TimelinePlanner(fps=self.fps)
+        # 마지막으로 렌더링한 비디오의 시간 계획 (오디오 mux에 그대로 사용)
+        self.timeline = None
+        
+        # 출력 백엔드: "moviepy" (기본) 또는 "raw" (imageio-ffmpeg 파이프 직접 쓰기)
+        self.backend = backend or os.getenv('RENDER_BACKEND', 'moviepy')
+
+        # 배경 프레임 캐시 (앞쪽 BACKGROUND_CACHE_FRAMES개를 BACKGROUND_CACHE_MB 안에서
+        # 메모리에 고정, BACKGROUND_CACHE_DIR 설정 시 BACKGROUND_CACHE_DISK_MB까지 디스크에도 저장)
+        self.frame_cache = BackgroundFrameCache(
+            max_frames=int(os.getenv('BACKGROUND_CACHE_FRAMES', '16')),
+            cache_dir=os.getenv('BACKGROUND_CACHE_DIR'),
+            max_bytes=int(os.getenv('BACKGROUND_CACHE_MB', '128')) << 20,
+            max_disk_bytes=int(os.getenv('BACKGROUND_CACHE_DISK_MB', '2048')) << 20,
+            workers=self.encoder_workers
+        )
 
     def create_intro(self, category="Quiz Game"):
-        duration = 5
-        clips = []
-        
-        # 배경
-        bg = self.create_animated_background(duration)
-        clips.append(bg)
+        duration = self.timeline_planner.intro_duration
+        compositor = StaticLayerCompositor(self.width, self.height)
         
-        # 타이틀 텍스트
+        # 타이틀 텍스트 (한 번만 래스터화)
         title = TextClip(
             category,
-            fontsize=100,
+            fontsize=self.layout.px(100),
             color='white',
             font=self.title_font,
-            size=(self.width-200, None)
-        ).set_position('center').set_duration(duration)
-        clips.append(title)
+            size=(self.width-self.layout.px(200), None)
+        )
+        image, mask = self._rasterize_text(title)
+        compositor.add_layer(image, ('center', 'center'), duration=duration, mask=mask)
         
-        return CompositeVideoClip(clips, size=(self.width, self.height))
+        return self._composited_clip(compositor, duration)
 
     def create_animated_background(self, duration):
         """배경 생성"""
-        def make_frame(t):
-            frame_number = int(t * self.fps)
-            return self.ui.create_geometric_background(frame_number)
-        return VideoClip(make_frame, duration=duration)
+        return VideoClip(self._background_frame, duration=duration)
 
-    def create_quiz_section(self, quiz_data, question_number):
-        duration = 15
-        clips = []
+    def _background_frame(self, t):
+        """t 시점의 배경 프레임 (캐시 사용, 읽기 전용)"""
+        frame_number = int(t * self.fps)
+        return self.frame_cache.get(
+            self.ui.current_scheme["name"],
+            frame_number,
+            (self.width, self.height),
+            self.ui.create_geometric_background,
+            fps=self.fps
+        )
+
+    def measure_narrations(self, quiz_data_list):
+        """질문 나레이션을 합성(캐시)하고 길이(초)를 측정 (실패하면 None)"""
+        tts_paths = self.tts.synthesize_many(
+            [quiz_data["question"] for quiz_data in quiz_data_list]
+        )
+        durations = []
+        for quiz_data in quiz_data_list:
+            path = tts_paths.get(quiz_data["question"])
+            try:
+                durations.append(self.audio_assets.duration(path, persist=False) if path else None)
+            except Exception as e:
+                print(f"Error measuring TTS duration: {e}")
+                durations.append(None)
+        return durations
+
+    def plan_timeline(self, quiz_data_list):
+        """전체 비디오 시간 계획 (비디오 하나에 한 번만 세우고 오디오에도 같은 객체를 넘김)"""
+        return self.timeline_planner.plan(self.measure_narrations(quiz_data_list))
+
+    def plan_section(self, quiz_data):
+        return self.timeline_planner.plan_section(self.measure_narrations([quiz_data])[0])
+
+    def create_quiz_section(self, quiz_data, question_number, timing=None):
+        """퀴즈 섹션 생성 (timing이 없으면 나레이션 길이를 측정해서 계획)"""
+        if timing is None:
+            timing = self.plan_section(quiz_data)
+        duration = timing.duration
         
-        # 배경
-        bg = self.create_animated_background(duration)
-        clips.append(bg)
+        # 정적 레이어는 구간별 오버레이 하나로 미리 합성
+        compositor = StaticLayerCompositor(self.width, self.height)
         
         # 이미지 가져오기
         image = self.ui.get_image_for_quiz(quiz_data["image_keywords"])
         
         # 위치 및 여백 계산
-        question_y = 150
-        first_button_y = 900
-        button_spacing = 180
+        question_y = self.layout.px(150)
+        first_button_y = self.layout.px(900)
+        button_spacing = self.layout.px(180)
         
         # 질문 카드
         question_position = ('center', question_y)
-        question_card = ImageClip(
+        compositor.add_layer(
             self.ui.create_modern_question_card(
                 question_text=quiz_data["question"],
                 number=question_number,
                 image=image
-            )
-        ).set_position(question_position).set_duration(duration)
-        clips.append(question_card)
+            ),
+            question_position,
+            duration=duration
+        )
         
         # 답안 버튼들 생성
         options = [quiz_data["correct_answer"]] + quiz_data["wrong_answers"]
@@ -727,225 +794,442 @@ class QuizVideoGenerator:
         for i, option in enumerate(options):
             button_y = first_button_y + (i * button_spacing)
             
+            # 1. 일반 상태
+            compositor.add_layer(
+                self.ui.create_modern_button(chr(65+i), option),
+                ('center', button_y),
+                start=0,
+                duration=timing.reveal
+            )
+            
             if option == quiz_data["correct_answer"]:
                 # 정답 버튼
-                # 1. 일반 상태
-                normal_button = ImageClip(
-                    self.ui.create_modern_button(chr(65+i), option)
-                ).set_position(('center', button_y))
-                normal_button = normal_button.set_start(0).set_duration(duration - 3)
-                clips.append(normal_button)
-                
                 # 2. 정답 효과 (텍스트 포함)
-                for j in range(3):
-                    highlight_button = ImageClip(
+                for j, start_time in enumerate(timing.pulses):
+                    compositor.add_layer(
                         self.ui.create_modern_button(
                             chr(65+i), 
                             option, 
                             selected=True,
                             scale_factor=1.2
-                        )
-                    ).set_position(('center', button_y))
-                    
-                    start_time = duration - 3 + j
-                    highlight_button = highlight_button.set_start(start_time).set_duration(0.7)
-                    clips.append(highlight_button)
+                        ),
+                        ('center', button_y),
+                        start=start_time,
+                        duration=0.7
+                    )
                     
-                    if j < 2:
-                        normal_button = ImageClip(
+                    if j < len(timing.pulses) - 1:
+                        compositor.add_layer(
                             self.ui.create_modern_button(
                                 chr(65+i), 
                                 option, 
                                 selected=True
-                            )
-                        ).set_position(('center', button_y))
-                        normal_button = normal_button.set_start(start_time + 0.7).set_duration(0.3)
-                        clips.append(normal_button)
+                            ),
+                            ('center', button_y),
+                            start=start_time + 0.7,
+                            duration=0.3
+                        )
             else:
                 # 오답 버튼
-                # 1. 일반 상태
-                normal_button = ImageClip(
-                    self.ui.create_modern_button(chr(65+i), option)
-                ).set_position(('center', button_y))
-                normal_button = normal_button.set_start(0).set_duration(duration - 3)
-                clips.append(normal_button)
-                
                 # 2. 흐린 상태 (버튼과 텍스트 모두 흐리게)
-                dim_button = ImageClip(
+                compositor.add_layer(
                     self.ui.create_modern_button(
                         chr(65+i), 
                         option, 
                         dimmed=True
-                    )
-                ).set_position(('center', button_y))
-                dim_button = dim_button.set_start(duration - 3).set_duration(3)
-                clips.append(dim_button)
+                    ),
+                    ('center', button_y),
+                    start=timing.reveal,
+                    duration=timing.reveal_duration
+                )
         
-        return CompositeVideoClip(clips, size=(self.width, self.height))
+        return self._composited_clip(compositor, duration)
 
     def create_outro(self, score):
         """아웃트로 생성"""
-        duration = 5
-        clips = []
-        
-        bg = self.create_animated_background(duration)
-        clips.append(bg)
+        duration = self.timeline_planner.outro_duration
+        compositor = StaticLayerCompositor(self.width, self.height)
         
         score_text = TextClip(
             f"Final Score: {score}%",
-            fontsize=80,
+            fontsize=self.layout.px(80),
             color='white',
             font=self.title_font,
-            size=(self.width, 200)
-        ).set_position('center').set_duration(duration)
-        clips.append(score_text)
+            size=(self.width, self.layout.px(200))
+        )
+        image, mask = self._rasterize_text(score_text)
+        compositor.add_layer(image, ('center', 'center'), duration=duration, mask=mask)
         
         end_message = TextClip(
             "Thanks for playing!",
-            fontsize=60,
+            fontsize=self.layout.px(60),
             color='white',
             font=self.text_font,
-            size=(self.width, 200)
-        ).set_position(('center', self.height//2 + 100))
-        end_message = end_message.set_duration(duration-1).set_start(1)
-        clips.append(end_message)
+            size=(self.width, self.layout.px(200))
+        )
+        image, mask = self._rasterize_text(end_message)
+        compositor.add_layer(
+            image,
+            ('center', self.height//2 + self.layout.px(100)),
+            start=1,
+            duration=duration-1,
+            mask=mask
+        )
         
-        return CompositeVideoClip(clips, size=(self.width, self.height))
+        return self._composited_clip(compositor, duration)
+
+    def _rasterize_text(self, text_clip):
+        """TextClip을 한 번만 렌더링해서 (이미지, 알파 마스크) 반환"""
+        image = text_clip.get_frame(0)
+        mask = text_clip.mask.get_frame(0) if text_clip.mask is not None else None
+        text_clip.close()
+        return image, mask
 
-    def create_video(self, quiz_data_list, category="Quiz Game"):
+    def _composited_clip(self, compositor, duration):
+        """배경 + 구간별 사전 합성 오버레이 클립"""
+        compositor.build(duration)
+        
+        def make_frame(t):
+            return compositor.compose(self._background_frame(t), t)
+        
+        return VideoClip(make_frame, duration=duration)
+
+    def create_video(self, quiz_data_list, category="Quiz Game", with_audio=False, expected_count=None):
+        """퀴즈 비디오 생성
+
+        with_audio=True이면 배경음악과 TTS를 미리 합성해서 한 번의 인코딩으로
+        quiz_video_with_audio.mp4를 만든다 (add_background_music 불필요).
+        parallel_workers가 2 이상이면 섹션별로 병렬 렌더링한다.
+        quiz_data_list가 이터레이터(QuizGenerator.stream_quiz)이면 퀴즈가 도착하는
+        대로 이미지 수집과 섹션 구성을 시작하고, 받은 목록은 self.quiz_data_list에 남는다.
+        expected_count가 주어지면 그보다 적게 도착했을 때 인코딩하지 않고 None을 반환한다.
+        """
+        audio_resources = []
+        self.timeline = None
         try:
-            if not quiz_data_list:
-                print("No quiz data provided")
-                return None
+            if isinstance(quiz_data_list, (list, tuple)):
+                if not quiz_data_list:
+                    print("No quiz data provided")
+                    return None
                 
-            # quiz_data_list 저장
-            self.quiz_data_list = quiz_data_list  # 여기에 저장
+                # quiz_data_list 저장
+                self.quiz_data_list = quiz_data_list  # 여기에 저장
                 
-            clips = []
-            
-            # 인트로
-            print("Creating intro...")
-            intro = self.create_intro(category)
-            clips.append(intro)
-            
-            # 퀴즈 섹션
-            for i, quiz_data in enumerate(quiz_data_list, 1):
-                print(f"Creating section for question {i}")
-                section = self.create_quiz_section(quiz_data, i)
-                if section:
-                    clips.append(section)
-            
-            # 아웃트로
-            print("Creating outro...")
-            outro = self.create_outro(100)
-            clips.append(outro)
+                # 모든 질문의 이미지를 미리 동시에 가져옴
+                self.ui.prefetch_images(
+                    [quiz_data["image_keywords"] for quiz_data in quiz_data_list]
+                )
+                quiz_items = quiz_data_list
+            else:
+                self.quiz_data_list = []
+                quiz_items = self._iter_arriving_quizzes(quiz_data_list, self.quiz_data_list)
             
-            print(f"Concatenating {len(clips)} clips...")
-            final_video = concatenate_videoclips(clips)
+            if self.parallel_workers > 1:
+                # 섹션 작업을 나누려면 전체 목록이 필요
+                quiz_data_list = list(quiz_items)
+                if not self._enough_quizzes(quiz_data_list, expected_count):
+                    return None
+                
+                # 워커들이 디스크 캐시를 쓰도록 수집 완료까지 대기
+                image_futures = self.ui.prefetch_images(
+                    [quiz_data["image_keywords"] for quiz_data in quiz_data_list]
+                )
+                for future in image_futures:
+                    future.exception()
+
+                # 섹션별 병렬 렌더링 후 재인코딩 없이 이어붙임
+                original_output = self._render_segments(quiz_data_list, category)
+                if with_audio:
+                    silent_output = original_output
+                    original_output = os.path.join(self.output_path, "quiz_video_with_audio.mp4")
+                    self._mux_audio_track(silent_output, quiz_data_list, original_output, self.timeline)
+            else:
+                original_output = self._render_sequential(
+                    quiz_items, category, with_audio, audio_resources, expected_count
+                )
+                if not original_output:
+                    return None
             
-            # 1. 기존 파일명으로 저장
-            original_output = os.path.join(self.output_path, "quiz_video.mp4")
-            print(f"Writing original video to: {original_output}")
-            final_video.write_videofile(
-                original_output,
-                fps=self.fps,
-                codec='libx264',
-                audio=False,
-                threads=4
-            )
+            print(f"Sprite cache: {self.ui.sprite_cache.stats()}")
             
             # 2. 날짜별 폴더에 복사본 저장
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-            date_folder = os.path.join(self.output_path, "date")
-            os.makedirs(date_folder, exist_ok=True)
-            
-            dated_output = os.path.join(date_folder, f"quiz_video_{timestamp}.mp4")
-            print(f"Copying to dated archive: {dated_output}")
-            import shutil
-            shutil.copy2(original_output, dated_output)
+            self._archive_copy(original_output, "_with_audio" if with_audio else "")
             
             return original_output
         except Exception as e:
             print(f"Error creating video: {str(e)}")
             traceback.print_exc()
             return None
+        finally:
+            self._close_audio_resources(audio_resources)
 
-    # QuizVideoGenerator 클래스에서
-    def add_background_music(self, video_path, quiz_data_list):
-        try:
-            from datetime import datetime
-            video = VideoFileClip(video_path)
-            
-            # TTS 클립 생성
-            tts_clips = []
-            intro_duration = 5  # 인트로 길이
-            question_duration = 15  # 각 질문 섹션 길이
-            
-            # 각 질문에 대한 TTS 생성 및 타이밍 설정
-            for i, quiz_data in enumerate(quiz_data_list):
-                # TTS 생성
-                tts_audio = self.generate_tts(quiz_data["question"])
-                if tts_audio:
-                    print(f"Adding TTS for question {i+1}")
-                    tts_clip = AudioFileClip(tts_audio)
-                    
-                    # 시작 시간 계산 (인트로 이후 각 섹션의 시작 부분)
-                    start_time = intro_duration + (i * question_duration) + 1  # 1초 딜레이
-                    
-                    # TTS 볼륨 및 타이밍 설정
-                    tts_clip = tts_clip.set_start(start_time).volumex(1.2)  # 볼륨 약간 증가
-                    tts_clips.append(tts_clip)
-            
-            # 배경 음악
-            music_path = os.path.join("assets", "audio", "christmas-spirit-265741.mp3")
-            print(f"Loading audio from: {music_path}")
-            background_music = AudioFileClip(music_path)
+    def _enough_quizzes(self, quiz_data_list, expected_count):
+        """받은 퀴즈가 없거나 expected_count보다 적으면 False (스트림이 중간에 끊긴 경우)"""
+        if not quiz_data_list:
+            print("No quiz data provided")
+            return False
+        if expected_count and len(quiz_data_list) < expected_count:
+            print(f"Only {len(quiz_data_list)}/{expected_count} quizzes arrived, skipping encode")
+            return False
+        return True
+
+    def _iter_arriving_quizzes(self, quiz_iterable, received):
+        """도착한 퀴즈마다 이미지 수집을 바로 시작하고 received에 모음"""
+        for quiz_data in quiz_iterable:
+            self.ui.prefetch_images([quiz_data["image_keywords"]])
+            received.append(quiz_data)
+            yield quiz_data
+
+    def _render_sequential(self, quiz_items, category, with_audio, audio_resources, expected_count=None):
+        """전체 비디오를 한 프로세스에서 렌더링 및 인코딩"""
+        clips = []
+        quiz_data_list = []
+        timings = []
+        
+        # 인트로
+        print("Creating intro...")
+        intro = self.create_intro(category)
+        clips.append(intro)
+        
+        # 퀴즈 섹션 (스트리밍이면 다음 퀴즈가 생성되는 동안 앞 섹션을 구성)
+        for i, quiz_data in enumerate(quiz_items, 1):
+            quiz_data_list.append(quiz_data)
+            print(f"Creating section for question {i}")
+            # 섹션 계획은 여기서 한 번만 세우고 오디오도 같은 계획을 씀
+            timing = self.plan_section(quiz_data)
+            timings.append(timing)
+            section = self.create_quiz_section(quiz_data, i, timing)
+            if section:
+                clips.append(section)
+        
+        if not self._enough_quizzes(quiz_data_list, expected_count):
+            return None
+        
+        # 아웃트로
+        print("Creating outro...")
+        outro = self.create_outro(100)
+        clips.append(outro)
+        
+        self.timeline = VideoTimeline(
+            self.timeline_planner.intro_duration, timings, self.timeline_planner.outro_duration
+        )
+        duration = sum(clip.duration for clip in clips)
+        
+        if with_audio and self.backend != "raw":
+            # 오디오를 미리 합성해서 같은 인코딩 패스에서 mux
+            final_audio, resources = self.build_audio_track(quiz_data_list, duration, self.timeline)
+            audio_resources.extend(resources)
+            original_output = os.path.join(self.output_path, "quiz_video_with_audio.mp4")
+            print(f"Writing video with audio to: {original_output}")
+            self.write_clips(clips, original_output, audio=final_audio)
+        else:
+            # 1. 기존 파일명으로 저장
+            original_output = os.path.join(self.output_path, "quiz_video.mp4")
+            print(f"Writing original video to: {original_output}")
+            self.write_clips(clips, original_output)
             
-            if background_music.duration < video.duration:
-                background_music = background_music.loop(duration=video.duration)
+            if with_audio:
+                # raw 백엔드는 오디오를 스트림 복사로 따로 mux
+                silent_output = original_output
+                original_output = os.path.join(self.output_path, "quiz_video_with_audio.mp4")
+                self._mux_audio_track(silent_output, quiz_data_list, original_output, self.timeline)
+        
+        self.frame_cache.flush()
+        print(f"Background frame cache: {self.frame_cache.stats()}")
+        
+        return original_output
+
+    def write_clips(self, clips, output_path, audio=None):
+        """클립들을 이어서 인코딩 (backend에 따라 MoviePy 또는 raw 파이프)"""
+        profile = self.render_profile
+        print(f"Encoding with {profile}")
+        if self.backend == "raw":
+            if audio is not None:
+                raise ValueError("raw backend does not encode audio; mux it afterwards")
+            writer = RawFrameWriter(
+                output_path, self.width, self.height, self.fps,
+                threads=self._encoder_threads(),
+                ffmpeg_params=["-preset", profile.preset] + self._encoder_params()
+            )
+            # MoviePy의 get_frame을 거치지 않고 make_frame을 직접 호출
+            return writer.write_segments([(clip.make_frame, clip.duration) for clip in clips])
+        
+        print(f"Concatenating {len(clips)} clips...")
+        final_video = concatenate_videoclips(clips)
+        if audio is not None:
+            final_video = final_video.set_audio(audio)
+            self._write_videofile(final_video, output_path, audio_codec='aac')
+        else:
+            self._write_videofile(final_video, output_path, audio=False)
+        return output_path
+
+    def _encoder_threads(self):
+        return self.render_profile.thread_count(self.encoder_workers)
+
+    def _encoder_params(self):
+        return self.render_profile.ffmpeg_params(self.fps, self.width, self.height)
+
+    def _write_videofile(self, clip, output_path, **kwargs):
+        """렌더 프로필의 preset/CRF/GOP/스레드 설정으로 MoviePy 인코딩"""
+        clip.write_videofile(
+            output_path,
+            fps=self.fps,
+            codec='libx264',
+            preset=self.render_profile.preset,
+            threads=self._encoder_threads(),
+            audio_bitrate=self.render_profile.audio_bitrate,
+            ffmpeg_params=self._encoder_params(),
+            **kwargs
+        )
+
+    def _render_segments(self, quiz_data_list, category):
+        """인트로/섹션/아웃트로를 프로세스 풀에서 각각 인코딩한 뒤 concat demuxer로 합침"""
+        segment_dir = os.path.join(self.output_path, "segments")
+        scheme_name = self.ui.current_scheme["name"]
+        
+        # 워커들이 같은 디스크 캐시 파일을 열 수 있도록 미리 생성
+        self.frame_cache.prepare(scheme_name, (self.width, self.height), self.fps)
+        
+        # 섹션 계획은 여기서 한 번만 세워서 워커와 오디오 mux에 넘김
+        timeline = self.plan_timeline(quiz_data_list)
+        self.timeline = timeline
+        
+        tasks = [{"kind": "intro", "category": category}]
+        for i, quiz_data in enumerate(quiz_data_list, 1):
+            tasks.append({
+                "kind": "section",
+                "quiz_data": quiz_data,
+                "number": i,
+                "timing": timeline.sections[i - 1]
+            })
+        tasks.append({"kind": "outro", "score": 100})
+        
+        for index, task in enumerate(tasks):
+            task["output_path"] = self.output_path
+            task["scheme_name"] = scheme_name
+            task["backend"] = self.backend
+            task["render_profile"] = self.render_profile.name
+            task["workers"] = self.parallel_workers
+            task["path"] = os.path.join(segment_dir, f"segment_{index:02d}.mp4")
+        
+        print(f"Rendering {len(tasks)} segments with {self.parallel_workers} workers...")
+        segment_paths = render_segments_parallel(tasks, self.parallel_workers)
+        
+        original_output = os.path.join(self.output_path, "quiz_video.mp4")
+        print(f"Joining segments into: {original_output}")
+        concat_segments(segment_paths, original_output, output_args=self.render_profile.container_args())
+        
+        for path in segment_paths:
+            os.remove(path)
+        
+        return original_output
+
+    def _archive_copy(self, video_path, suffix=""):
+        """날짜별 폴더에 복사본 저장"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        date_folder = os.path.join(self.output_path, "date")
+        os.makedirs(date_folder, exist_ok=True)
+        
+        dated_output = os.path.join(date_folder, f"quiz_video_{timestamp}{suffix}.mp4")
+        print(f"Copying to dated archive: {dated_output}")
+        shutil.copy2(video_path, dated_output)
+        return dated_output
+
+    def build_audio_track(self, quiz_data_list, duration, timeline=None):
+        """배경음악과 TTS를 합성한 오디오 트랙 생성
+
+        나레이션 위치는 비디오를 렌더링할 때 세운 시간 계획(timeline)에서 가져온다.
+        (timeline이 없을 때만 새로 계획 - 이미 렌더링한 비디오와 어긋날 수 있음)
+        (오디오 클립, 정리할 리소스 목록)을 반환한다.
+        """
+        # TTS 클립 생성
+        tts_clips = []
+        if timeline is None:
+            timeline = self.plan_timeline(quiz_data_list)
+        
+        # 모든 질문의 TTS를 동시에 생성 (캐시된 문장은 다시 합성하지 않음)
+        tts_paths = self.tts.synthesize_many(
+            [quiz_data["question"] for quiz_data in quiz_data_list]
+        )
+        
+        # 각 질문에 대한 TTS 타이밍 설정
+        for i, quiz_data in enumerate(quiz_data_list):
+            tts_audio = tts_paths.get(quiz_data["question"])
+            if tts_audio:
+                print(f"Adding TTS for question {i+1}")
+                tts_clip = self._cached_audio_clip(tts_audio, persist=False)
+                
+                # 시작 시간 계산 (섹션 시작 + 나레이션 딜레이)
+                start_time = timeline.question_audio_start(i)
+                
+                # TTS 볼륨 및 타이밍 설정
+                tts_clip = tts_clip.set_start(start_time).volumex(1.2)  # 볼륨 약간 증가
+                tts_clips.append(tts_clip)
+        
+        # 배경 음악
+        music_path = os.path.join("assets", "audio", "christmas-spirit-265741.mp3")
+        print(f"Loading audio from: {music_path}")
+        # 디코딩된 PCM 캐시에서 바로 읽음 (짧으면 반복)
+        background_music = self._cached_audio_clip(music_path, duration=duration, loop=True)
+        
+        # 배경음악 볼륨을 더 낮게 설정
+        background_music = background_music.volumex(0.1)
+        
+        # 음성과 배경음악 합성
+        print("Combining audio tracks...")
+        final_audio = CompositeAudioClip([background_music] + tts_clips).set_duration(duration)
+        return final_audio, [background_music] + tts_clips
+
+    def _cached_audio_clip(self, path, duration=None, loop=False, persist=True):
+        """AudioAssetCache의 샘플을 읽는 오디오 클립 (TTS는 persist=False로 디스크에 남기지 않음)"""
+        fps = self.audio_assets.sample_rate
+        samples = self.audio_assets.load(path, persist=persist)
+        length = len(samples)
+        
+        def make_frame(t):
+            index = (np.asarray(t) * fps).astype(int)
+            if loop:
+                index = index % length
             else:
-                background_music = background_music.subclip(0, video.duration)
-            
-            # 배경음악 볼륨을 더 낮게 설정
-            background_music = background_music.volumex(0.1)
-            
-            # 음성과 배경음악 합성
-            print("Combining audio tracks...")
-            final_audio = CompositeAudioClip([background_music] + tts_clips)
-            final_video = video.set_audio(final_audio)
-            
+                index = np.clip(index, 0, length - 1)
+            return samples[index].astype(np.float32) / 32768.0
+        
+        return AudioClip(make_frame, duration=duration or length / fps, fps=fps)
+
+    def _close_audio_resources(self, clips):
+        """오디오 클립 정리 (TTS 파일은 캐시이므로 삭제하지 않음)"""
+        for clip in clips:
+            try:
+                clip.close()
+            except:
+                pass
+
+    # QuizVideoGenerator 클래스에서
+    def add_background_music(self, video_path, quiz_data_list, stream_copy=True, timeline=None):
+        """이미 인코딩된 비디오에 배경음악과 TTS 추가
+
+        stream_copy=True이면 비디오 스트림은 그대로 복사하고 오디오만 mux한다.
+        timeline은 비디오를 렌더링할 때 세운 계획(create_video 후 self.timeline)이다.
+        """
+        audio_resources = []
+        try:
             # 파일 저장
             original_output = os.path.join(self.output_path, "quiz_video_with_audio.mp4")
             print(f"Saving video with audio to: {original_output}")
-            final_video.write_videofile(
-                original_output,
-                fps=self.fps,
-                codec='libx264',
-                audio_codec='aac',
-                threads=4
-            )
             
-            # 날짜별 저장
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            date_folder = os.path.join(self.output_path, "date")
-            dated_output = os.path.join(date_folder, f"quiz_video_{timestamp}_with_audio.mp4")
-            print(f"Copying to dated archive: {dated_output}")
-            shutil.copy2(original_output, dated_output)
+            if stream_copy:
+                self._mux_audio_track(video_path, quiz_data_list, original_output, timeline)
+            else:
+                video = VideoFileClip(video_path, audio=False)
+                final_audio, audio_resources = self.build_audio_track(
+                    quiz_data_list, video.duration, timeline
+                )
+                final_video = video.set_audio(final_audio)
+                self._write_videofile(final_video, original_output, audio_codec='aac')
+                video.close()
             
-            # 리소스 정리
-            video.close()
-            background_music.close()
-            for clip in tts_clips:
-                clip.close()
-                
-            # 임시 TTS 파일들 정리
-            for clip in tts_clips:
-                try:
-                    os.remove(clip.filename)
-                except:
-                    pass
+            # 날짜별 저장
+            self._archive_copy(original_output, "_with_audio")
             
             return original_output
                 
@@ -953,20 +1237,36 @@ class QuizVideoGenerator:
             print(f"Error adding audio: {e}")
             traceback.print_exc()
             return None
+        finally:
+            # 리소스 정리
+            self._close_audio_resources(audio_resources)
 
-    def generate_tts(self, text):
-        """Google TTS를 사용한 음성 생성"""
+    def _mux_audio_track(self, video_path, quiz_data_list, output_path, timeline=None):
+        """오디오 트랙만 인코딩해서 비디오 스트림 복사로 mux"""
+        audio_resources = []
+        audio_path = os.path.join(self.output_path, "quiz_audio.m4a")
         try:
-            from gtts import gTTS
-            import tempfile
+            video = VideoFileClip(video_path, audio=False)
+            duration = video.duration
+            video.close()
             
-            # 임시 파일 생성
-            with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as temp_file:
-                # 영어로 TTS 생성 (속도는 slow=False로 설정)
-                tts = gTTS(text=text, lang='en', slow=False)
-                tts.save(temp_file.name)
-                return temp_file.name
-                
+            final_audio, audio_resources = self.build_audio_track(quiz_data_list, duration, timeline)
+            final_audio.write_audiofile(
+                audio_path, fps=44100, codec='aac', bitrate=self.render_profile.audio_bitrate
+            )
+            return mux_audio(
+                video_path, audio_path, output_path,
+                output_args=self.render_profile.container_args()
+            )
+        finally:
+            self._close_audio_resources(audio_resources)
+            if os.path.exists(audio_path):
+                os.remove(audio_path)
+
+    def generate_tts(self, text):
+        """TTS 음성 생성 (캐시된 오디오 파일 경로 반환)"""
+        try:
+            return self.tts.synthesize(text)
         except Exception as e:
             print(f"Error generating TTS: {e}")
-            return None
\ No newline at end of file
+            return None
@@ -0,0 +1,225 @@
+# src/video/image_fetcher.py
+import os
+import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from src.utils.quota_ledger import QuotaLedger
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.bmp')
+
+
+class GoogleImageSearchBackend:
+    """Google Custom Search 이미지 검색 백엔드
+
+    디스커버리 클라이언트는 한 번만 만들고, httplib2는 스레드 안전하지 않으므로
+    요청 실행용 Http 객체만 스레드별로 둔다.
+    quota(QuotaLedger)가 있으면 검색 호출을 일일 쿼터에 기록한다.
+    """
+
+    def __init__(self, api_key, search_engine_id, session, timeout=(5, 20), quota=None):
+        self.api_key = api_key
+        self.search_engine_id = search_engine_id
+        self.session = session
+        self.timeout = timeout
+        self.quota = quota
+
+        self._service = None
+        self._service_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _get_service(self):
+        if self._service is None:
+            with self._service_lock:
+                if self._service is None:
+                    from googleapiclient.discovery import build
+                    self._service = build(
+                        "customsearch", "v1",
+                        developerKey=self.api_key,
+                        cache_discovery=False
+                    )
+        return self._service
+
+    def _get_http(self):
+        http = getattr(self._local, "http", None)
+        if http is None:
+            from googleapiclient.http import build_http
+            http = build_http()
+            self._local.http = http
+        return http
+
+    def fetch(self, keywords):
+        """키워드로 이미지를 검색해서 원본 바이트 반환 (없으면 None)"""
+        if self.quota is not None:
+            if not self.quota.can_spend("customsearch"):
+                print(f"Custom Search daily quota used up, skipping image search: {keywords}")
+                return None
+            self.quota.record("customsearch")
+
+        enhanced_query = f"{keywords} high quality photo"
+        result = self._get_service().cse().list(
+            q=enhanced_query,
+            cx=self.search_engine_id,
+            searchType='image',
+            num=1,
+            imgType='photo',
+            safe='active'
+        ).execute(http=self._get_http())
+
+        if 'items' not in result:
+            return None
+
+        image_url = result['items'][0]['link']
+        print(f"Found image for keywords: {keywords}")
+
+        response = self.session.get(image_url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.content
+
+
+class LocalDirectoryImageBackend:
+    """테스트용 백엔드: 로컬 디렉토리의 이미지를 반환
+
+    키워드가 파일 이름에 들어 있는 이미지를 우선 사용하고,
+    없으면 키워드 해시로 하나를 고른다.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def fetch(self, keywords):
+        files = sorted(
+            name for name in os.listdir(self.directory)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        if not files:
+            return None
+
+        words = [word for word in keywords.lower().split() if len(word) > 2]
+        matches = [
+            name for name in files
+            if any(word in os.path.splitext(name)[0].lower() for word in words)
+        ]
+        candidates = matches or files
+        index = int(hashlib.sha1(keywords.encode("utf-8")).hexdigest(), 16) % len(candidates)
+
+        with open(os.path.join(self.directory, candidates[index]), "rb") as f:
+            return f.read()
+
+
+class ImageFetcher:
+    """퀴즈 이미지 수집 단계
+
+    - 렌더링 전에 모든 질문의 이미지를 동시에 가져옴 (prefetch)
+    - 키워드별 인덱스 + 내용 해시(sha256) 기반 디스크 캐시
+    """
+
+    def __init__(self, backend, cache_dir=os.path.join("assets", "images", "cache"), max_workers=4):
+        self.backend = backend
+        self.cache_dir = cache_dir
+        self.blob_dir = os.path.join(cache_dir, "blobs")
+        self.index_dir = os.path.join(cache_dir, "index")
+        os.makedirs(self.blob_dir, exist_ok=True)
+        os.makedirs(self.index_dir, exist_ok=True)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        # 진행 중인 요청만 보관 (끝나면 디스크 캐시에서 읽음)
+        self._futures = {}
+        # 이미 끝난 future의 콜백은 prefetch 안에서 바로 실행되므로 재진입 가능해야 함
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_env(cls):
+        """환경 변수 설정으로 생성 (IMAGE_SOURCE_DIR이 있으면 로컬 백엔드)"""
+        local_dir = os.getenv('IMAGE_SOURCE_DIR')
+        if local_dir:
+            backend = LocalDirectoryImageBackend(local_dir)
+        else:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=2)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            backend = GoogleImageSearchBackend(
+                os.getenv('GOOGLE_API_KEY'),
+                os.getenv('GOOGLE_SEARCH_ENGINE_ID'),
+                session,
+                quota=QuotaLedger.from_env()
+            )
+        return cls(backend, cache_dir=os.getenv('IMAGE_CACHE_DIR', os.path.join("assets", "images", "cache")))
+
+    def _index_path(self, keywords):
+        key = hashlib.sha1(keywords.strip().lower().encode("utf-8")).hexdigest()
+        return os.path.join(self.index_dir, f"{key}.json")
+
+    def _read_cache(self, keywords):
+        index_path = self._index_path(keywords)
+        if not os.path.exists(index_path):
+            return None
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                digest = json.load(f)["sha256"]
+            with open(os.path.join(self.blob_dir, digest), "rb") as f:
+                return f.read()
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_cache(self, keywords, data):
+        digest = hashlib.sha256(data).hexdigest()
+        blob_path = os.path.join(self.blob_dir, digest)
+        if not os.path.exists(blob_path):
+            tmp_path = f"{blob_path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, blob_path)
+
+        index_path = self._index_path(keywords)
+        tmp_path = f"{index_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"keywords": keywords, "sha256": digest}, f)
+        os.replace(tmp_path, index_path)
+
+    def _load(self, keywords):
+        data = self._read_cache(keywords)
+        if data is not None:
+            return data
+
+        data = self.backend.fetch(keywords)
+        if data:
+            self._write_cache(keywords, data)
+        return data
+
+    def prefetch(self, keywords_list):
+        """여러 키워드의 이미지를 백그라운드에서 동시에 가져옴 (future 목록 반환)
+
+        같은 키워드의 진행 중인 요청은 공유하고, 끝난 요청은 바로 잊어서
+        (성공하면 디스크 캐시에 있고, 실패하면 다음 요청 때 다시 시도)
+        오래 실행되는 프로세스에 이미지 바이트가 쌓이지 않게 한다.
+        """
+        futures = []
+        with self._lock:
+            for keywords in keywords_list:
+                future = self._futures.get(keywords)
+                if future is None:
+                    future = self._executor.submit(self._load, keywords)
+                    self._futures[keywords] = future
+                    future.add_done_callback(
+                        lambda done, keywords=keywords: self._forget(keywords, done)
+                    )
+                futures.append(future)
+        return futures
+
+    def _forget(self, keywords, future):
+        with self._lock:
+            if self._futures.get(keywords) is future:
+                del self._futures[keywords]
+
+    def fetch(self, keywords):
+        """이미지 바이트 반환 (prefetch 중이면 완료를 기다림, 실패 시 None)"""
+        future = self.prefetch([keywords])[0]
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"Error fetching image for '{keywords}': {e}")
+            return None
@@ -0,0 +1,41 @@
+# src/video/layout.py
+
+
+class Layout:
+    """기준 해상도(1080x1920, 30fps)에서 정한 픽셀/프레임 값을 목표 해상도와 fps에 맞게 변환
+
+    스프라이트, 배경, 텍스트 위치는 모두 기준 해상도의 값으로 적고
+    layout.px()로 변환해서 쓴다. 초안(540x960)이나 720p로 렌더링해도
+    같은 배치가 유지된다.
+    """
+
+    BASE_WIDTH = 1080
+    BASE_HEIGHT = 1920
+    BASE_FPS = 30
+
+    def __init__(self, width=BASE_WIDTH, height=BASE_HEIGHT, fps=BASE_FPS):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        # 세로 비율이 다르면 작은 쪽에 맞춤
+        self.scale = min(width / self.BASE_WIDTH, height / self.BASE_HEIGHT)
+
+    @property
+    def key(self):
+        """스프라이트 캐시 키에 넣는 값"""
+        return round(self.scale, 4)
+
+    def px(self, value):
+        """기준 픽셀 값 -> 목표 해상도 픽셀 (선 두께 등이 0이 되지 않도록 최소 1)"""
+        return max(1, int(round(value * self.scale)))
+
+    def font(self, value):
+        """cv2 폰트 배율"""
+        return value * self.scale
+
+    def per_frame(self, value):
+        """기준 fps에서 프레임당 변화량 -> 목표 fps에서 프레임당 변화량 (시간 기준으로 같은 속도)"""
+        return value * self.BASE_FPS / self.fps
+
+    def __repr__(self):
+        return f"Layout({self.width}x{self.height}@{self.fps}fps, scale={self.scale:.3f})"
@@ -0,0 +1,41 @@
+# src/video/parallel.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def render_segment(task):
+    """워커 프로세스에서 인트로/퀴즈 섹션/아웃트로 하나를 렌더링 및 인코딩"""
+    from src.video.generator import QuizVideoGenerator
+
+    video_gen = QuizVideoGenerator(
+        output_path=task["output_path"],
+        scheme_name=task["scheme_name"],
+        parallel_workers=0,
+        backend=task["backend"],
+        render_profile=task["render_profile"]
+    )
+    video_gen.encoder_workers = task["workers"]
+    # 워커 프로세스들이 배경 프레임 메모리 예산을 나눠 씀
+    video_gen.frame_cache.workers = task["workers"]
+
+    if task["kind"] == "intro":
+        clip = video_gen.create_intro(task["category"])
+    elif task["kind"] == "section":
+        clip = video_gen.create_quiz_section(task["quiz_data"], task["number"], task.get("timing"))
+    else:
+        clip = video_gen.create_outro(task["score"])
+
+    print(f"Encoding segment: {task['path']}")
+    video_gen.write_clips([clip], task["path"])
+    clip.close()
+    video_gen.frame_cache.flush()
+    return task["path"]
+
+
+def render_segments_parallel(tasks, max_workers):
+    """세그먼트들을 프로세스 풀에서 동시에 렌더링 (입력 순서대로 경로 반환)"""
+    for task in tasks:
+        os.makedirs(os.path.dirname(task["path"]) or ".", exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(render_segment, tasks))
@@ -0,0 +1,86 @@
+# src/video/raw_writer.py
+import queue
+import threading
+import numpy as np
+import imageio_ffmpeg
+
+
+class RawFrameWriter:
+    """uint8 프레임을 imageio-ffmpeg 파이프에 직접 쓰는 출력 백엔드
+
+    프레임 생성(생산자 스레드)과 인코더 파이프 쓰기(소비자)를
+    미리 할당한 버퍼 풀과 크기가 제한된 큐로 겹쳐서 실행한다.
+    """
+
+    def __init__(self, output_path, width, height, fps, codec='libx264',
+                 threads=4, queue_size=8, ffmpeg_params=None):
+        self.output_path = output_path
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.codec = codec
+        self.threads = threads
+        self.queue_size = queue_size
+        self.ffmpeg_params = list(ffmpeg_params or [])
+
+    def write_segments(self, segments):
+        """segments: (make_frame(t), duration) 목록을 순서대로 인코딩"""
+        free_buffers = queue.Queue()
+        for _ in range(self.queue_size):
+            free_buffers.put(np.empty((self.height, self.width, 3), dtype=np.uint8))
+        # 버퍼 풀 크기가 큐 길이를 제한한다
+        filled_buffers = queue.Queue()
+
+        stop = threading.Event()
+        errors = []
+
+        def produce():
+            try:
+                for make_frame, duration in segments:
+                    frame_count = int(round(duration * self.fps))
+                    for i in range(frame_count):
+                        buffer = free_buffers.get()
+                        if stop.is_set():
+                            return
+                        np.copyto(buffer, make_frame(i / self.fps), casting='unsafe')
+                        filled_buffers.put(buffer)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                filled_buffers.put(None)
+
+        writer = imageio_ffmpeg.write_frames(
+            self.output_path,
+            (self.width, self.height),
+            fps=self.fps,
+            codec=self.codec,
+            quality=None,
+            macro_block_size=1,
+            output_params=['-threads', str(self.threads)] + self.ffmpeg_params
+        )
+        writer.send(None)
+
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+
+        frames_written = 0
+        try:
+            while True:
+                buffer = filled_buffers.get()
+                if buffer is None:
+                    break
+                writer.send(buffer)
+                free_buffers.put(buffer)
+                frames_written += 1
+        finally:
+            # 소비자 쪽 에러 시 생산자 종료
+            stop.set()
+            free_buffers.put(np.empty((self.height, self.width, 3), dtype=np.uint8))
+            producer.join()
+            writer.close()
+
+        if errors:
+            raise errors[0]
+
+        print(f"Wrote {frames_written} frames to: {self.output_path}")
+        return self.output_path
@@ -0,0 +1,105 @@
+# src/video/render_profiles.py
+import os
+from src.video.layout import Layout
+
+
+class RenderProfile:
+    """인코더 설정 묶음 (x264 preset, CRF, 스레드, GOP, faststart, 출력 크기)
+
+    - gop_seconds: 키프레임 간격 (초, fps에 맞춰 프레임 수로 변환)
+    - threads: None이면 CPU 수를 동시에 인코딩하는 워커 수로 나눠서 사용
+    - scale: 기준 해상도(1080x1920) 대비 렌더링 해상도 배율
+    - fps: None이면 생성기의 기본 fps
+    """
+
+    def __init__(self, name, preset, crf, gop_seconds=2.0, threads=None, faststart=False,
+                 scale=1.0, fps=None, audio_bitrate="192k", tune=None, maxrate=None):
+        self.name = name
+        self.preset = preset
+        self.crf = crf
+        self.gop_seconds = gop_seconds
+        self.threads = threads
+        self.faststart = faststart
+        self.scale = scale
+        self.fps = fps
+        self.audio_bitrate = audio_bitrate
+        self.tune = tune
+        self.maxrate = maxrate
+
+    def thread_count(self, workers=1):
+        """인코더 스레드 수 (동시에 인코딩하는 프로세스가 CPU를 나눠 씀)"""
+        if self.threads is not None:
+            return self.threads
+        return max(1, (os.cpu_count() or 4) // max(1, workers))
+
+    def output_size(self, width=Layout.BASE_WIDTH, height=Layout.BASE_HEIGHT):
+        """출력 해상도 (x264/yuv420p를 위해 짝수로 맞춤)"""
+        return (int(round(width * self.scale)) // 2 * 2, int(round(height * self.scale)) // 2 * 2)
+
+    def container_args(self):
+        """컨테이너 옵션 (스트림 복사로 mux/concat할 때도 같은 옵션을 써야 함)"""
+        return ["-movflags", "+faststart"] if self.faststart else []
+
+    def ffmpeg_params(self, fps, width, height):
+        """preset과 스레드를 제외한 비디오 인코더 옵션
+
+        width/height는 입력 프레임 크기로, 프로필 해상도와 다를 때만 -vf scale을 붙인다.
+        """
+        keyint = max(1, int(round(self.gop_seconds * fps)))
+        params = [
+            "-crf", str(self.crf),
+            "-g", str(keyint),
+            "-keyint_min", str(keyint),
+            "-sc_threshold", "0",
+            "-pix_fmt", "yuv420p",
+        ]
+        if self.tune:
+            params += ["-tune", self.tune]
+        if self.maxrate:
+            params += ["-maxrate", self.maxrate, "-bufsize", self.maxrate_buffer()]
+        output_size = self.output_size()
+        if output_size != (width, height):
+            params += ["-vf", f"scale={output_size[0]}:{output_size[1]}"]
+        return params + self.container_args()
+
+    def maxrate_buffer(self):
+        value, unit = self.maxrate[:-1], self.maxrate[-1]
+        return f"{float(value) * 2:g}{unit}"
+
+    def __repr__(self):
+        return f"RenderProfile({self.name}: preset={self.preset}, crf={self.crf}, scale={self.scale})"
+
+
+RENDER_PROFILES = {
+    # 내용 확인용 미리보기: 540x960, 15fps로 직접 렌더링, 가장 빠른 preset
+    "draft": RenderProfile(
+        "draft", preset="ultrafast", crf=30, gop_seconds=2.0,
+        scale=0.5, fps=15, audio_bitrate="96k"
+    ),
+    # YouTube Shorts 업로드용: 평면 그래픽에 맞춘 tune, 비트레이트 상한, faststart
+    "publish": RenderProfile(
+        "publish", preset="medium", crf=23, gop_seconds=1.0,
+        faststart=True, audio_bitrate="192k", tune="animation", maxrate="8M"
+    ),
+    # 같은 설정의 720x1280 변형
+    "publish_720p": RenderProfile(
+        "publish_720p", preset="medium", crf=23, gop_seconds=1.0,
+        faststart=True, audio_bitrate="192k", tune="animation", maxrate="5M",
+        scale=2 / 3
+    ),
+    # 보관용 고화질
+    "archive": RenderProfile(
+        "archive", preset="slow", crf=18, gop_seconds=2.0,
+        faststart=True, audio_bitrate="256k"
+    ),
+}
+
+
+def get_render_profile(name=None):
+    """이름으로 프로필 반환 (없으면 RENDER_PROFILE 환경 변수, 기본 publish)"""
+    if isinstance(name, RenderProfile):
+        return name
+    name = name or os.getenv('RENDER_PROFILE', 'publish')
+    if name not in RENDER_PROFILES:
+        raise ValueError(f"Unknown render profile: {name} (choose from {', '.join(RENDER_PROFILES)})")
+    return RENDER_PROFILES[name]
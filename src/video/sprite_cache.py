@@ -0,0 +1,64 @@
+# src/video/sprite_cache.py
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class SpriteCache:
+    """버튼, 질문 카드, 대체 이미지 스프라이트 LRU 캐시
+
+    키는 스프라이트를 그리는 데 쓰인 입력값과 색상 조합이다.
+    캐시된 스프라이트는 읽기 전용 배열로 반환된다.
+    """
+
+    def __init__(self, max_items=256):
+        self.max_items = max_items
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_create(self, key, factory):
+        """캐시된 스프라이트 반환, 없으면 factory()로 생성"""
+        with self._lock:
+            sprite = self._items.get(key)
+            if sprite is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return sprite
+            self.misses += 1
+
+        sprite = factory()
+        sprite.flags.writeable = False
+
+        with self._lock:
+            self._items[key] = sprite
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+        return sprite
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "cached_sprites": len(self._items),
+            }
+
+
+def image_digest(image):
+    """이미지 배열 내용 기반 캐시 키"""
+    if image is None:
+        return None
+    return (image.shape, hashlib.sha1(image.tobytes()).hexdigest())
+
+
+# 같은 프로세스의 여러 비디오(배치 실행)가 공유하는 기본 캐시
+default_sprite_cache = SpriteCache()
@@ -0,0 +1,131 @@
+# src/video/timeline.py
+import math
+
+
+class SectionTiming:
+    """퀴즈 섹션 하나의 시간 계획 (섹션 시작 기준, 초)
+
+    - question_start / question_end: 질문 나레이션 구간
+    - reveal: 정답 공개 (오답 흐리게, 정답 강조 시작)
+    - pulses: 정답 버튼 강조 애니메이션 시작 시각들
+    """
+
+    def __init__(self, duration, question_start, question_end, reveal, pulses):
+        self.duration = duration
+        self.question_start = question_start
+        self.question_end = question_end
+        self.reveal = reveal
+        self.pulses = pulses
+
+    @property
+    def reveal_duration(self):
+        return self.duration - self.reveal
+
+    def to_dict(self):
+        return {
+            "duration": self.duration,
+            "question_start": self.question_start,
+            "question_end": self.question_end,
+            "reveal": self.reveal,
+            "pulses": list(self.pulses)
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def __repr__(self):
+        return (f"SectionTiming(duration={self.duration}, question={self.question_start}-"
+                f"{self.question_end}, reveal={self.reveal})")
+
+
+class VideoTimeline:
+    """인트로, 퀴즈 섹션들, 아웃트로로 이루어진 전체 비디오 시간 계획
+
+    비디오 하나에 한 번만 계획하고 비디오와 오디오가 같은 객체를 쓴다.
+    작업 체크포인트(JSON)에 저장할 때는 to_dict/from_dict를 사용한다.
+    """
+
+    def __init__(self, intro_duration, sections, outro_duration):
+        self.intro_duration = intro_duration
+        self.sections = sections
+        self.outro_duration = outro_duration
+
+    def section_start(self, index):
+        """index번째 섹션의 비디오 기준 시작 시각"""
+        return self.intro_duration + sum(section.duration for section in self.sections[:index])
+
+    def question_audio_start(self, index):
+        """index번째 질문 나레이션의 비디오 기준 시작 시각"""
+        return self.section_start(index) + self.sections[index].question_start
+
+    @property
+    def total_duration(self):
+        return self.section_start(len(self.sections)) + self.outro_duration
+
+    def to_dict(self):
+        return {
+            "intro_duration": self.intro_duration,
+            "sections": [section.to_dict() for section in self.sections],
+            "outro_duration": self.outro_duration
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data["intro_duration"],
+            [SectionTiming.from_dict(section) for section in data["sections"]],
+            data["outro_duration"]
+        )
+
+
+class TimelinePlanner:
+    """측정한 나레이션 길이로 섹션 길이와 이벤트 시각을 계산
+
+    정답 공개는 질문 나레이션이 끝나고 think_time 뒤에 오고, 섹션은 공개 후
+    reveal_duration만큼 이어진다. 나레이션이 길면 섹션이 늘어나서 다음 섹션과
+    겹치지 않고, 짧으면 섹션도 짧아진다. 모든 시각은 프레임 경계로 올림한다.
+    나레이션 길이를 모르면 기존 고정 레이아웃(12초에 공개, 15초 섹션)을 쓴다.
+    """
+
+    def __init__(self, fps=30, intro_duration=5, outro_duration=5, narration_delay=1.0,
+                 think_time=3.0, reveal_duration=3.0, min_reveal=5.0, fallback_reveal=12.0):
+        self.fps = fps
+        self.intro_duration = intro_duration
+        self.outro_duration = outro_duration
+        self.narration_delay = narration_delay
+        self.think_time = think_time
+        self.reveal_duration = reveal_duration
+        self.min_reveal = min_reveal
+        self.fallback_reveal = fallback_reveal
+
+    def _to_frame(self, seconds):
+        return math.ceil(round(seconds * self.fps, 6)) / self.fps
+
+    def plan_section(self, narration_duration):
+        """질문 나레이션 길이(초, 모르면 None)로 섹션 계획 생성"""
+        question_start = self.narration_delay
+        if narration_duration is None:
+            question_end = question_start
+            reveal = self.fallback_reveal
+        else:
+            question_end = self._to_frame(question_start + narration_duration)
+            reveal = max(self.min_reveal, self._to_frame(question_end + self.think_time))
+
+        # 공개 구간 동안 1초마다 정답 버튼 강조
+        pulses = [reveal + j for j in range(max(1, int(self.reveal_duration)))]
+        return SectionTiming(
+            duration=reveal + self.reveal_duration,
+            question_start=question_start,
+            question_end=question_end,
+            reveal=reveal,
+            pulses=pulses
+        )
+
+    def plan(self, narration_durations):
+        """질문별 나레이션 길이 목록으로 전체 비디오 계획 생성"""
+        return VideoTimeline(
+            self.intro_duration,
+            [self.plan_section(duration) for duration in narration_durations],
+            self.outro_duration
+        )